@@ -3,10 +3,9 @@
 __author__ = 'Bruce Frank Wong'
 
 
-from typing import List, Optional, Any
-from enum import Enum
-from copy import deepcopy
-from dataclasses import dataclass
+from typing import List, Iterator, Optional, Any
+from enum import Enum, IntEnum
+from dataclasses import dataclass, field
 
 
 class Action(Enum):
@@ -38,7 +37,8 @@ class Action(Enum):
         return self.value
 
 
-class LogLevel(Enum):
+# 日志级别为 IntEnum，可以直接比较大小，热点路径上不必每次取 .value。
+class LogLevel(IntEnum):
     Off = 0
     Simple = 1
     Normal = 2
@@ -98,23 +98,31 @@ class FractalPotential(Enum):
 
 
 class Trend(Enum):
+    # 只有两个成员，其它名称是别名（指向同一个成员）。
+    Bullish = '上升'
+    Bearish = '下降'
     U = '上升'
     D = '下降'
     Up = '上升'
     Down = '下降'
-    Bullish = '上升'
-    Bearish = '下降'
 
     def __str__(self) -> str:
         return self.value
 
 
+# 频繁比较的枚举成员，绑定为模块级常量，避免每次比较时在类上查找属性。
+_TOP: FractalPattern = FractalPattern.Top
+_BOTTOM: FractalPattern = FractalPattern.Bottom
+_BULLISH: Trend = Trend.Bullish
+_BEARISH: Trend = Trend.Bearish
+
+
 class LinearElementMode(Enum):
     UDU = '上下上'
     DUD = '下上下'
 
 
-@dataclass
+@dataclass(slots=True)
 class OrdinaryCandle:
     high: float
     low: float
@@ -123,15 +131,17 @@ class OrdinaryCandle:
         return f'OrdinaryCandle (high = {self.high}, low = {self.low})'
 
 
-@dataclass
+@dataclass(slots=True)
 class MergedCandle(OrdinaryCandle):
     id: int
     period: int
     left_ordinary_id: int
 
-    @property
-    def right_ordinary_id(self) -> int:
-        return self.left_ordinary_id + self.period - 1
+    # 右侧普通K线 id 在生成时计算一次，合并普通K线（period += 1）时同步 += 1。
+    right_ordinary_id: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.right_ordinary_id = self.left_ordinary_id + self.period - 1
 
     @property
     def ordinary_id(self) -> int:
@@ -144,7 +154,7 @@ class MergedCandle(OrdinaryCandle):
                f'high = {self.high}, low = {self.low})'
 
 
-@dataclass
+@dataclass(slots=True)
 class Fractal:
     id: int
     pattern: FractalPattern
@@ -187,20 +197,25 @@ class Fractal:
                f'confirmed = {self.is_confirmed})'
 
 
-@dataclass
+@dataclass(slots=True)
 class Stroke:
     id: int
     trend: Trend
     left_candle: MergedCandle
     right_candle: MergedCandle
 
-    @property
-    def left_merged_id(self) -> int:
-        return self.left_candle.id
+    # 左侧合并K线不会再变化（笔只向右延伸，合并只发生在最新的合并K线上），
+    # 左侧的值在生成时计算一次。右侧随笔的延伸而变化，仍然是 property。
+    is_bullish: bool = field(init=False, repr=False, compare=False)
+    left_merged_id: int = field(init=False, repr=False, compare=False)
+    left_ordinary_id: int = field(init=False, repr=False, compare=False)
+    left_price: float = field(init=False, repr=False, compare=False)
 
-    @property
-    def left_ordinary_id(self) -> int:
-        return self.left_candle.ordinary_id
+    def __post_init__(self) -> None:
+        self.is_bullish = self.trend == Trend.Bullish
+        self.left_merged_id = self.left_candle.id
+        self.left_ordinary_id = self.left_candle.ordinary_id
+        self.left_price = self.left_candle.low if self.is_bullish else self.left_candle.high
 
     @property
     def right_merged_id(self) -> int:
@@ -210,16 +225,9 @@ class Stroke:
     def right_ordinary_id(self) -> int:
         return self.right_candle.ordinary_id
 
-    @property
-    def left_price(self) -> float:
-        if self.trend == Trend.Bullish:
-            return self.left_candle.low
-        else:
-            return self.left_candle.high
-
     @property
     def right_price(self) -> float:
-        if self.trend == Trend.Bullish:
+        if self.is_bullish:
             return self.right_candle.high
         else:
             return self.right_candle.low
@@ -249,48 +257,50 @@ class Stroke:
                f'left price = {self.left_price}, right price = {self.right_price})'
 
 
-@dataclass
+@dataclass(slots=True)
 class Segment:
     id: int
     trend: Trend
     left_candle: MergedCandle
     right_candle: MergedCandle
-    stroke_id_list: List[int]
+    left_stroke_id: int     # 线段由连续的笔构成，只记录首尾两根笔的 id。
+    right_stroke_id: int
 
-    @property
-    def left_merged_id(self) -> int:
-        return self.left_candle.id
+    # 同 Stroke，左侧的值在生成时计算一次。
+    is_bullish: bool = field(init=False, repr=False, compare=False)
+    left_merged_id: int = field(init=False, repr=False, compare=False)
+    left_ordinary_id: int = field(init=False, repr=False, compare=False)
+    left_price: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.is_bullish = self.trend == Trend.Bullish
+        self.left_merged_id = self.left_candle.id
+        self.left_ordinary_id = self.left_candle.ordinary_id
+        self.left_price = self.left_candle.low if self.is_bullish else self.left_candle.high
 
     @property
     def right_merged_id(self) -> int:
         return self.right_candle.id
 
-    @property
-    def left_ordinary_id(self) -> int:
-        return self.left_candle.ordinary_id
-
     @property
     def right_ordinary_id(self) -> int:
         return self.right_candle.ordinary_id
 
+    @property
+    def stroke_id_list(self) -> List[int]:
+        return list(range(self.left_stroke_id, self.right_stroke_id + 1))
+
     @property
     def strokes_count(self) -> int:
-        return len(self.stroke_id_list)
+        return self.right_stroke_id - self.left_stroke_id + 1
 
     @property
     def period(self) -> int:
         return self.right_ordinary_id - self.left_ordinary_id
 
-    @property
-    def left_price(self) -> float:
-        if self.trend == Trend.Bullish:
-            return self.left_candle.low
-        else:
-            return self.left_candle.high
-
     @property
     def right_price(self) -> float:
-        if self.trend == Trend.Bullish:
+        if self.is_bullish:
             return self.right_candle.high
         else:
             return self.right_candle.low
@@ -312,7 +322,7 @@ class Segment:
                f'count of strokes = {self.strokes_count}, strokes = {self.stroke_id_list})'
 
 
-@dataclass
+@dataclass(slots=True)
 class IsolationLine:
     id: int
     candle: MergedCandle
@@ -331,7 +341,7 @@ class IsolationLine:
                f'ordinary id = {self.candle.right_ordinary_id})'
 
 
-@dataclass
+@dataclass(slots=True)
 class Pivot:
     id: int
     left_candle: MergedCandle
@@ -339,18 +349,20 @@ class Pivot:
     high: float
     low: float
 
-    @property
-    def left_merged_id(self) -> int:
-        return self.left_candle.id
+    # 同 Stroke，左侧的值在生成时计算一次；中枢的高低点生成后不再变化。
+    left_merged_id: int = field(init=False, repr=False, compare=False)
+    left_ordinary_id: int = field(init=False, repr=False, compare=False)
+    price_range: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.left_merged_id = self.left_candle.id
+        self.left_ordinary_id = self.left_candle.ordinary_id
+        self.price_range = self.high - self.low
 
     @property
     def right_merged_id(self) -> int:
         return self.right_candle.id
 
-    @property
-    def left_ordinary_id(self) -> int:
-        return self.left_candle.ordinary_id
-
     @property
     def right_ordinary_id(self) -> int:
         return self.right_candle.ordinary_id
@@ -359,10 +371,6 @@ class Pivot:
     def period(self) -> int:
         return self.right_ordinary_id - self.left_ordinary_id
 
-    @property
-    def price_range(self) -> float:
-        return self.high - self.low
-
     @property
     def slope(self) -> float:
         return self.price_range / self.period
@@ -465,6 +473,7 @@ Period30S.lower = None
 
 class ChanTheory:
 
+    # 各元素列表的公开属性返回列表的浅拷贝，列表中的元素与内部共享，只读，不要修改。
     _merged_candles: List[MergedCandle]
     _fractals: List[Fractal]
     _strokes: List[Stroke]
@@ -525,7 +534,7 @@ class ChanTheory:
 
         :return:
         """
-        return deepcopy(self._merged_candles)
+        return list(self._merged_candles)
 
     @property
     def fractals_count(self) -> int:
@@ -543,7 +552,7 @@ class ChanTheory:
 
         :return:
         """
-        return deepcopy(self._fractals)
+        return list(self._fractals)
 
     @property
     def strokes_count(self) -> int:
@@ -561,7 +570,7 @@ class ChanTheory:
 
         :return:
         """
-        return deepcopy(self._strokes)
+        return list(self._strokes)
 
     @property
     def segments_count(self) -> int:
@@ -579,7 +588,7 @@ class ChanTheory:
 
         :return:
         """
-        return deepcopy(self._segments)
+        return list(self._segments)
 
     @property
     def isolation_lines_count(self) -> int:
@@ -597,7 +606,7 @@ class ChanTheory:
 
         :return:
         """
-        return deepcopy(self._isolation_lines)
+        return list(self._isolation_lines)
 
     @property
     def stroke_pivots_count(self) -> int:
@@ -615,7 +624,7 @@ class ChanTheory:
 
         :return:
         """
-        return deepcopy(self._stroke_pivots)
+        return list(self._stroke_pivots)
 
     @property
     def segment_pivots_count(self) -> int:
@@ -633,7 +642,39 @@ class ChanTheory:
 
         :return:
         """
-        return deepcopy(self._segment_pivots)
+        return list(self._segment_pivots)
+
+    def iter_merged_candles(self) -> Iterator[MergedCandle]:
+        """
+        Iterate over the merged candles without copying the list.
+
+        :return: iterator of MergedCandle.
+        """
+        return iter(self._merged_candles)
+
+    def iter_fractals(self) -> Iterator[Fractal]:
+        """
+        Iterate over the fractals without copying the list.
+
+        :return: iterator of Fractal.
+        """
+        return iter(self._fractals)
+
+    def iter_strokes(self) -> Iterator[Stroke]:
+        """
+        Iterate over the strokes without copying the list.
+
+        :return: iterator of Stroke.
+        """
+        return iter(self._strokes)
+
+    def iter_segments(self) -> Iterator[Segment]:
+        """
+        Iterate over the segments without copying the list.
+
+        :return: iterator of Segment.
+        """
+        return iter(self._segments)
 
     @staticmethod
     def is_inclusive(left_candle: OrdinaryCandle,
@@ -8,8 +8,9 @@ from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
-from matplotlib.patches import Rectangle
-from matplotlib.collections import PatchCollection
+from matplotlib.collections import PolyCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.text import Text
 import mplfinance as mpf
 
 from .definition import (
@@ -18,6 +19,10 @@ from .definition import (
 
     FractalPattern,
     Trend,
+    _TOP,
+    _BOTTOM,
+    _BULLISH,
+    _BEARISH,
     OrdinaryCandle,
     MergedCandle,
     Fractal,
@@ -62,13 +67,129 @@ from .log_message import (
     log_test_result_price_range,
     log_test_result_price_break,
 )
+from .plot import get_plot_style
 from .utility import (
+    _jit,
+    merge_candles,
+    _merge_candle_prices_py,
     is_fractal_pattern,
     generate_merged_candle,
 )
 
 
-@dataclass
+# 分型类型、笔和线段趋势的整数编码（int8），仅在内部的热点比较中使用，
+# 对外仍然是 FractalPattern / Trend。
+# 趋势编码为 +1 / -1，同向判断即编码相等，价格方向判断可以乘以编码后与 0 比较。
+_PATTERN_TOP: int = 0
+_PATTERN_BOT: int = 1
+_TREND_BULL: int = 1
+_TREND_BEAR: int = -1
+
+_PATTERN_CODE: Dict[FractalPattern, int] = {
+    FractalPattern.Top: _PATTERN_TOP,
+    FractalPattern.Bottom: _PATTERN_BOT,
+}
+_TREND_CODE: Dict[Trend, int] = {
+    Trend.Bullish: _TREND_BULL,
+    Trend.Bearish: _TREND_BEAR,
+}
+
+# 列缓冲区的初始容量。
+_INITIAL_CAPACITY: int = 1024
+
+
+@_jit('boolean(int64, int64, float64, float64)')
+def _is_segment_extended(segment_trend: int,
+                         stroke_trend: int,
+                         stroke_right_price: float,
+                         segment_right_price: float
+                         ) -> bool:
+    """
+    线段与笔同向，且笔的右侧价 达到或超越 线段的右侧价。
+
+    :param segment_trend:       int. 线段的趋势编码。
+    :param stroke_trend:        int. 笔的趋势编码。
+    :param stroke_right_price:  float. 笔的右侧价。
+    :param segment_right_price: float. 线段（或线段内右侧笔）的右侧价。
+    :return: bool.
+    """
+    return (
+            segment_trend == stroke_trend and
+            segment_trend * (stroke_right_price - segment_right_price) >= 0
+    )
+
+
+@_jit('boolean(int64, int64, float64, float64, float64, float64, float64)')
+def _is_segment_reversed(segment_trend: int,
+                         right_trend: int,
+                         left_left_price: float,
+                         left_right_price: float,
+                         right_left_price: float,
+                         right_right_price: float,
+                         segment_left_price: float
+                         ) -> bool:
+    """
+    最新3根笔 与 线段 反向突破，可以生成反向线段。
+
+    :param segment_trend:      int. 线段的趋势编码。
+    :param right_trend:        int. 右侧笔的趋势编码。
+    :param left_left_price:    float. 左侧笔的左侧价。
+    :param left_right_price:   float. 左侧笔的右侧价。
+    :param right_left_price:   float. 右侧笔的左侧价。
+    :param right_right_price:  float. 右侧笔的右侧价。
+    :param segment_left_price: float. 线段内右侧笔的左侧价。
+    :return: bool.
+    """
+    return (
+            segment_trend == _TREND_BULL and
+            right_trend == _TREND_BEAR and
+            right_left_price < left_left_price and
+            (
+                    right_right_price <= left_right_price
+                    or
+                    left_right_price < segment_left_price
+            )
+    ) or (
+            segment_trend == _TREND_BEAR and
+            right_trend == _TREND_BULL and
+            right_left_price > left_left_price and
+            (
+                    right_right_price >= left_right_price
+                    or
+                    left_right_price > segment_left_price
+            )
+    )
+
+
+@_jit('boolean(int64, float64, float64, float64, float64)')
+def _is_gap_segment(right_trend: int,
+                    left_left_price: float,
+                    left_right_price: float,
+                    right_left_price: float,
+                    right_right_price: float
+                    ) -> bool:
+    """
+    右侧笔 相对 左侧笔 同向跳空，可以生成跳空线段。
+
+    :param right_trend:       int. 右侧笔的趋势编码。
+    :param left_left_price:   float. 左侧笔的左侧价。
+    :param left_right_price:  float. 左侧笔的右侧价。
+    :param right_left_price:  float. 右侧笔的左侧价。
+    :param right_right_price: float. 右侧笔的右侧价。
+    :return: bool.
+    """
+    return (
+            right_trend == _TREND_BULL and
+            right_left_price >= left_left_price and
+            right_right_price > left_right_price
+    ) or (
+            right_trend == _TREND_BEAR and
+            right_left_price <= left_left_price and
+            right_right_price < left_right_price
+    )
+
+
+@dataclass(slots=True)
 class PotentialFractal:
     candle: MergedCandle
     pattern: FractalPattern
@@ -83,7 +204,7 @@ class PotentialFractal:
 
     @property
     def extreme_price(self) -> float:
-        if self.pattern == FractalPattern.Top:
+        if self.pattern == _TOP:
             return self.candle.high
         else:
             return self.candle.low
@@ -102,6 +223,32 @@ class ChanTheoryDynamic(ChanTheory):
 
     _potential_fractal: PotentialFractal
 
+    # 与 _merged_candles / _fractals / _strokes / _segments 一一对应的列缓冲区，
+    # 有效长度即对应列表的长度，容量不足时加倍。
+    _mc_high: np.ndarray
+    _mc_low: np.ndarray
+    _mc_period: np.ndarray
+    _mc_left_ordinary_id: np.ndarray
+    _fractal_pattern: np.ndarray
+    _fractal_middle_id: np.ndarray
+    _stroke_trend: np.ndarray
+    _stroke_left: np.ndarray
+    _stroke_right: np.ndarray
+    _stroke_high: np.ndarray
+    _stroke_low: np.ndarray
+    _segment_trend: np.ndarray
+
+    # 最新笔的右侧合并K线 id，没有笔时为 -1。
+    _last_stroke_right_merged_id: int
+
+    # 各列表的长度，在追加时递增，避免热点路径上反复调用 len()。
+    _merged_candles_count: int
+    _fractals_count: int
+    _strokes_count: int
+    _segments_count: int
+    _isolation_lines_count: int
+    _stroke_pivots_count: int
+
     def __init__(self,
                  strict_mode: bool = True,
                  log_level: LogLevel = LogLevel.Normal
@@ -117,12 +264,213 @@ class ChanTheoryDynamic(ChanTheory):
             log_level=log_level
         )
 
+        # 合并K线的最高价、最低价、周期、左侧普通K线 id。
+        self._mc_high = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._mc_low = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._mc_period = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._mc_left_ordinary_id = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+
+        # 分型的类型编码，笔、线段的趋势编码。
+        self._fractal_pattern = np.empty(_INITIAL_CAPACITY, dtype=np.int8)
+        self._stroke_trend = np.empty(_INITIAL_CAPACITY, dtype=np.int8)
+        self._segment_trend = np.empty(_INITIAL_CAPACITY, dtype=np.int8)
+
+        # 分型中间合并K线的 id。
+        self._fractal_middle_id = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+
+        # 笔的左侧价、右侧价、最高价、最低价。
+        self._stroke_left = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._stroke_right = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._stroke_high = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._stroke_low = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+
+        self._last_stroke_right_merged_id = -1
+
+        self._merged_candles_count = 0
+        self._fractals_count = 0
+        self._strokes_count = 0
+        self._segments_count = 0
+        self._isolation_lines_count = 0
+        self._stroke_pivots_count = 0
+
+    @property
+    def merged_candles_count(self) -> int:
+        """
+        Count of the merged candles list.
+
+        :return: int.
+        """
+        return self._merged_candles_count
+
+    @property
+    def fractals_count(self) -> int:
+        """
+        Count of the fractals list.
+
+        :return: int.
+        """
+        return self._fractals_count
+
+    @property
+    def strokes_count(self) -> int:
+        """
+        Count of the strokes list.
+
+        :return: int.
+        """
+        return self._strokes_count
+
+    @property
+    def segments_count(self) -> int:
+        """
+        Count of the segments list.
+
+        :return: int.
+        """
+        return self._segments_count
+
+    @property
+    def isolation_lines_count(self) -> int:
+        """
+        Count of the isolation lines list.
+
+        :return: int.
+        """
+        return self._isolation_lines_count
+
+    @property
+    def stroke_pivots_count(self) -> int:
+        """
+        Count of the stroke pivots list.
+
+        :return: int.
+        """
+        return self._stroke_pivots_count
+
+    def _grow(self, name: str, capacity: int) -> None:
+        """
+        Grow the column buffer <name> to <capacity>, keeping its content.
+
+        :param name:     str. Attribute name of the column.
+        :param capacity: int. New capacity.
+        :return: None.
+        """
+        column: np.ndarray = getattr(self, name)
+        new_column: np.ndarray = np.empty(capacity, dtype=column.dtype)
+        new_column[:column.shape[0]] = column
+        setattr(self, name, new_column)
+
+    def _append_merged_candle(self, candle: MergedCandle) -> None:
+        """
+        Append a merged candle, and record its values.
+
+        :param candle: MergedCandle.
+        :return: None.
+        """
+        idx: int = self._merged_candles_count
+        if idx == self._mc_high.shape[0]:
+            for name in ('_mc_high', '_mc_low', '_mc_period', '_mc_left_ordinary_id'):
+                self._grow(name, idx * 2)
+
+        self._merged_candles.append(candle)
+        self._merged_candles_count += 1
+        self._mc_high[idx] = candle.high
+        self._mc_low[idx] = candle.low
+        self._mc_period[idx] = candle.period
+        self._mc_left_ordinary_id[idx] = candle.left_ordinary_id
+
+    def _refresh_last_merged_candle(self) -> None:
+        """
+        Refresh values of the last merged candle, after an ordinary candle was merged into it.
+
+        :return: None.
+        """
+        idx: int = self._merged_candles_count - 1
+        candle: MergedCandle = self._merged_candles[idx]
+        self._mc_high[idx] = candle.high
+        self._mc_low[idx] = candle.low
+        self._mc_period[idx] = candle.period
+
+    def _append_fractal(self, fractal: Fractal) -> None:
+        """
+        Append a fractal, and record its pattern code and middle candle id.
+
+        :param fractal: Fractal.
+        :return: None.
+        """
+        idx: int = self._fractals_count
+        if idx == self._fractal_pattern.shape[0]:
+            for name in ('_fractal_pattern', '_fractal_middle_id'):
+                self._grow(name, idx * 2)
+
+        self._fractals.append(fractal)
+        self._fractals_count += 1
+        self._fractal_pattern[idx] = _PATTERN_CODE[fractal.pattern]
+        self._fractal_middle_id[idx] = fractal.middle_candle.id
+
+    def _append_stroke(self, stroke: Stroke) -> None:
+        """
+        Append a stroke, and record its trend code and prices.
+
+        :param stroke: Stroke.
+        :return: None.
+        """
+        idx: int = self._strokes_count
+        if idx == self._stroke_trend.shape[0]:
+            for name in (
+                    '_stroke_trend', '_stroke_left', '_stroke_right', '_stroke_high', '_stroke_low'
+            ):
+                self._grow(name, idx * 2)
+
+        self._strokes.append(stroke)
+        self._strokes_count += 1
+        self._stroke_trend[idx] = _TREND_CODE[stroke.trend]
+        self._refresh_last_stroke()
+
+    def _refresh_last_stroke(self) -> None:
+        """
+        Refresh prices of the last stroke, after its right candle was replaced or merged.
+
+        :return: None.
+        """
+        if self._strokes_count == 0:
+            return
+
+        idx: int = self._strokes_count - 1
+        stroke: Stroke = self._strokes[idx]
+        left_price: float = stroke.left_price
+        right_price: float = stroke.right_price
+        self._stroke_left[idx] = left_price
+        self._stroke_right[idx] = right_price
+        if left_price > right_price:
+            self._stroke_high[idx] = left_price
+            self._stroke_low[idx] = right_price
+        else:
+            self._stroke_high[idx] = right_price
+            self._stroke_low[idx] = left_price
+        self._last_stroke_right_merged_id = stroke.right_candle.id
+
+    def _append_segment(self, segment: Segment) -> None:
+        """
+        Append a segment, and record its trend code.
+
+        :param segment: Segment.
+        :return: None.
+        """
+        idx: int = self._segments_count
+        if idx == self._segment_trend.shape[0]:
+            self._grow('_segment_trend', idx * 2)
+
+        self._segments.append(segment)
+        self._segments_count += 1
+        self._segment_trend[idx] = _TREND_CODE[segment.trend]
+
     def get_ordinary_candle_id(self,
                                merged_candle_id: int
                                ) -> Optional[int]:
         if merged_candle_id < 0:
             raise ValueError('<merged_candle_id> should be positive integer.')
-        elif 0 <= merged_candle_id <= self.merged_candles_count:
+        elif 0 <= merged_candle_id <= self._merged_candles_count:
             return self._merged_candles[merged_candle_id].right_ordinary_id
         else:
             return None
@@ -147,10 +495,11 @@ class ChanTheoryDynamic(ChanTheory):
         old_candle_left: Optional[MergedCandle]
         old_candle_right: Optional[MergedCandle]
 
-        if self.merged_candles_count >= 2:
+        merged_candles_count: int = self._merged_candles_count
+        if merged_candles_count >= 2:
             old_candle_right = self._merged_candles[-1]
             old_candle_left = self._merged_candles[-2]
-        elif self.merged_candles_count == 1:
+        elif merged_candles_count == 1:
             old_candle_right = self._merged_candles[-1]
             old_candle_left = None
         else:
@@ -168,7 +517,7 @@ class ChanTheoryDynamic(ChanTheory):
                 new_element=new_candle
             )
 
-            self._merged_candles.append(new_candle)
+            self._append_merged_candle(new_candle)
 
             return Action.MergedCandleGenerated
         else:
@@ -177,8 +526,63 @@ class ChanTheoryDynamic(ChanTheory):
                 merged_candle=new_candle
             )
 
+            # 最新合并K线被原地修改，最新笔的右侧价可能随之变化。
+            self._refresh_last_merged_candle()
+            self._refresh_last_stroke()
+
             return Action.MergedCandleUpdated
 
+    def _apply_merged_candle(self,
+                             is_new: int,
+                             high: float,
+                             low: float
+                             ) -> Action:
+        """
+        Apply a merged candle state computed by <merge_candles>, instead of merging an ordinary candle.
+
+        :param is_new: int. 1 if a new merged candle should be generated, 0 if the last one was merged into.
+        :param high:   float. High price of the last merged candle after this ordinary candle.
+        :param low:    float. Low price of the last merged candle after this ordinary candle.
+        :return: Action. <Action.MergedCandleGenerated> or <Action.MergedCandleUpdated>, the same as
+                 <update_merged_candle>.
+        """
+        if is_new:
+            new_candle: MergedCandle = MergedCandle(
+                id=self._merged_candles_count,
+                high=high,
+                low=low,
+                period=1,
+                left_ordinary_id=(
+                    self._merged_candles[-1].right_ordinary_id + 1 if self._merged_candles_count > 0 else 0
+                )
+            )
+
+            log_event_candle_generated(
+                log_level=self._log_level,
+                new_element=new_candle
+            )
+
+            self._append_merged_candle(new_candle)
+
+            return Action.MergedCandleGenerated
+
+        last_candle: MergedCandle = self._merged_candles[-1]
+        last_candle.high = high
+        last_candle.low = low
+        last_candle.period += 1
+        last_candle.right_ordinary_id += 1
+
+        log_event_candle_updated(
+            log_level=self._log_level,
+            merged_candle=last_candle
+        )
+
+        # 最新合并K线被原地修改，最新笔的右侧价可能随之变化。
+        self._refresh_last_merged_candle()
+        self._refresh_last_stroke()
+
+        return Action.MergedCandleUpdated
+
     def update_strokes(self,
                        log_level: Optional[LogLevel] = None
                        ) -> Action:
@@ -225,16 +629,16 @@ class ChanTheoryDynamic(ChanTheory):
         log_try_to_generate_first_stroke(log_level=log_level)
 
         # Parameters validation.
-        if self.merged_candles_count == 0:
+        if self._merged_candles_count == 0:
             raise RuntimeError(
                 'No merged candle data, run <generate_merged_candles_with_dataframe> before.'
             )
 
         # log "not enough merged candles".
-        if self.merged_candles_count < self.minimum_distance:
+        if self._merged_candles_count < self.minimum_distance:
             log_not_enough_merged_candles(
                 log_level=log_level,
-                count=self.merged_candles_count,
+                count=self._merged_candles_count,
                 required=self.minimum_distance
             )
             return Action.NothingChanged
@@ -261,39 +665,66 @@ class ChanTheoryDynamic(ChanTheory):
         left_side_candle_right: MergedCandle
         left_fractal_pattern: FractalPattern
 
+        # 循环内的日志只在 Detailed 级别输出，在循环外判断一次。
+        is_detailed: bool = log_level >= LogLevel.Detailed
+
+        # 不需要输出逐根K线的测试日志时，用列运算代替下面的循环。
+        if not is_detailed:
+            left_id: Optional[int] = self._find_first_stroke_left_id(right_fractal_pattern)
+            if left_id is None:
+                return Action.NothingChanged
+
+            return self._create_first_stroke(
+                left_side_candle_left=self._merged_candles[left_id - 1] if left_id > 0 else None,
+                left_side_candle_middle=self._merged_candles[left_id],
+                left_side_candle_right=self._merged_candles[left_id + 1],
+                left_fractal_pattern=_BOTTOM if right_fractal_pattern == _TOP else _TOP,
+                right_side_candle_left=right_side_candle_left,
+                right_side_candle_middle=right_side_candle_middle,
+                right_fractal_pattern=right_fractal_pattern,
+                log_level=log_level
+            )
+
+        # 循环内反复访问的属性，在循环外绑定为局部变量。
+        merged_candles: List[MergedCandle] = self._merged_candles
+        right_middle_id: int = right_side_candle_middle.id
+        minimum_distance: int = self.minimum_distance
+
         # Start loop.
-        for i in range(1, right_side_candle_middle.id):
+        for i in range(1, right_middle_id):
 
             # Get left side candles.
             if i == 1:
                 left_side_candle_left = None
-                left_side_candle_middle = self._merged_candles[i - 1]
-                left_side_candle_right = self._merged_candles[i]
+                left_side_candle_middle = merged_candles[i - 1]
+                left_side_candle_right = merged_candles[i]
             else:
-                left_side_candle_left = self._merged_candles[i - 2]
-                left_side_candle_middle = self._merged_candles[i - 1]
-                left_side_candle_right = self._merged_candles[i]
+                left_side_candle_left = merged_candles[i - 2]
+                left_side_candle_middle = merged_candles[i - 1]
+                left_side_candle_right = merged_candles[i]
 
             # Log left side candles.
-            log_show_mobile_side_candles_in_generating_stroke(
-                log_level=log_level,
-                left_candle=left_side_candle_left,
-                middle_candle=left_side_candle_middle,
-                right_candle=left_side_candle_right
-            )
+            if is_detailed:
+                log_show_mobile_side_candles_in_generating_stroke(
+                    log_level=log_level,
+                    left_candle=left_side_candle_left,
+                    middle_candle=left_side_candle_middle,
+                    right_candle=left_side_candle_right
+                )
 
             # 测试：是否满足最小距离要求。
-            distance: int = right_side_candle_middle.id - left_side_candle_middle.id
+            distance: int = right_middle_id - left_side_candle_middle.id
 
             # Log distance test result.
-            log_test_result_distance(
-                log_level=log_level,
-                distance=distance,
-                distance_required=self.minimum_distance
-            )
+            if is_detailed:
+                log_test_result_distance(
+                    log_level=log_level,
+                    distance=distance,
+                    distance_required=minimum_distance
+                )
 
             # 如果测试未通过，进入下一次合并K线循环。
-            if distance < self.minimum_distance:
+            if distance < minimum_distance:
                 return Action.NothingChanged
 
             # 测试：是否可以构成分型。
@@ -304,10 +735,11 @@ class ChanTheoryDynamic(ChanTheory):
             )
 
             # 显示测试结果。
-            log_test_result_fractal(
-                log_level=log_level,
-                fractal_pattern=left_fractal_pattern
-            )
+            if is_detailed:
+                log_test_result_fractal(
+                    log_level=log_level,
+                    fractal_pattern=left_fractal_pattern
+                )
 
             # 如果测试未通过，进入下一次合并K线循环。
             if left_fractal_pattern is None:
@@ -317,11 +749,12 @@ class ChanTheoryDynamic(ChanTheory):
             #     形成的分型与 right_merged_candle 形成的潜在分型同类
             # 退出循环。
             # Log fractal pattern test result.
-            log_test_result_fractal_pattern(
-                log_level=log_level,
-                left_fractal_pattern=left_fractal_pattern,
-                right_fractal_pattern=right_fractal_pattern
-            )
+            if is_detailed:
+                log_test_result_fractal_pattern(
+                    log_level=log_level,
+                    left_fractal_pattern=left_fractal_pattern,
+                    right_fractal_pattern=right_fractal_pattern
+                )
 
             if left_fractal_pattern == right_fractal_pattern:
                 continue
@@ -329,7 +762,7 @@ class ChanTheoryDynamic(ChanTheory):
             # 判定两端分型的中间K线。
             price_low: float
             price_high: float
-            if right_fractal_pattern == FractalPattern.Top:
+            if right_fractal_pattern == _TOP:
                 price_low = left_side_candle_middle.low
                 price_high = right_side_candle_middle.high
             else:
@@ -340,8 +773,8 @@ class ChanTheoryDynamic(ChanTheory):
             is_price_break_low: bool = False
             candle: MergedCandle
             price_break_candle: Optional[MergedCandle] = None
-            for j in range(left_side_candle_middle.id + 1, right_side_candle_middle.id):
-                candle = self.merged_candles[j]
+            for j in range(left_side_candle_middle.id + 1, right_middle_id):
+                candle = merged_candles[j]
                 if candle.low < price_low:
                     is_price_break_low = True
                     price_break_candle = candle
@@ -351,65 +784,148 @@ class ChanTheoryDynamic(ChanTheory):
                     price_break_candle = candle
                     break
 
-            log_test_result_price_range(
-                log_level=log_level,
-                break_high=is_price_break_high,
-                break_low=is_price_break_low,
-                candle=price_break_candle
-            )
+            if is_detailed:
+                log_test_result_price_range(
+                    log_level=log_level,
+                    break_high=is_price_break_high,
+                    break_low=is_price_break_low,
+                    candle=price_break_candle
+                )
 
             if is_price_break_high or is_price_break_low:
                 continue
 
-            # Generate the first pair of fractals.
-            new_fractal: Fractal = Fractal(
-                id=self.fractals_count,
-                pattern=left_fractal_pattern,
-                left_candle=left_side_candle_left,
-                middle_candle=left_side_candle_middle,
-                right_candle=left_side_candle_right,
-                is_confirmed=True
-            )
-            self._fractals.append(new_fractal)
-            log_event_fractal_generated(
-                log_level=log_level,
-                new_element=new_fractal
+            return self._create_first_stroke(
+                left_side_candle_left=left_side_candle_left,
+                left_side_candle_middle=left_side_candle_middle,
+                left_side_candle_right=left_side_candle_right,
+                left_fractal_pattern=left_fractal_pattern,
+                right_side_candle_left=right_side_candle_left,
+                right_side_candle_middle=right_side_candle_middle,
+                right_fractal_pattern=right_fractal_pattern,
+                log_level=log_level
             )
 
-            new_fractal: Fractal = Fractal(
-                id=self.fractals_count,
-                pattern=right_fractal_pattern,
-                left_candle=right_side_candle_left,
-                middle_candle=right_side_candle_middle,
-                right_candle=None,
-                is_confirmed=False
-            )
-            self._fractals.append(new_fractal)
-            log_event_fractal_generated(
-                log_level=log_level,
-                new_element=new_fractal
-            )
+        return Action.NothingChanged
 
-            # Generate the first stroke.
-            new_stroke: Stroke = Stroke(
-                id=self.strokes_count,
-                trend=Trend.Bullish if left_fractal_pattern == FractalPattern.Bottom
-                else Trend.Bearish,
-                left_candle=left_side_candle_middle,
-                right_candle=right_side_candle_middle
-            )
-            self._strokes.append(new_stroke)
-            log_event_stroke_generated(
-                log_level=log_level,
-                new_element=new_stroke
-            )
+    def _find_first_stroke_left_id(self,
+                                   right_fractal_pattern: FractalPattern
+                                   ) -> Optional[int]:
+        """
+        Find the middle candle of the left side fractal of the first stroke, with column
+        operations on the merged candles instead of testing candle by candle.
 
-            return Action.StrokeGenerated
+        It returns the same candle as the loop in <generate_first_stroke>: the leftmost merged
+        candle which keeps the minimum distance to the last merged candle, forms a fractal of
+        the opposite pattern, and no candle between them breaks the extreme prices.
 
-        return Action.NothingChanged
+        :param right_fractal_pattern: FractalPattern. Pattern of the right side potential fractal.
+        :return: int, id of the middle candle of the left side fractal. None if not found.
+        """
+        right_id: int = self._merged_candles_count - 1
+        last_id: int = right_id - self.minimum_distance  # 满足最小距离要求的最大 id
+        if last_id < 0:
+            return None
+
+        high: np.ndarray = self._mc_high[:right_id + 1]
+        low: np.ndarray = self._mc_low[:right_id + 1]
+
+        # 测试：是否可以构成分型。
+        # id = 0 的合并K线只有右侧K线，是左侧潜在分型，与循环一样用 is_fractal_pattern 判断。
+        is_top: np.ndarray = np.empty(last_id + 1, dtype=np.bool_)
+        is_bottom: np.ndarray = np.empty(last_id + 1, dtype=np.bool_)
+        is_top[0] = is_fractal_pattern(
+            left_candle=None,
+            middle_candle=self._merged_candles[0],
+            right_candle=self._merged_candles[1]
+        ) == _TOP
+        is_bottom[0] = not is_top[0]
+        if last_id > 0:
+            middle_high: np.ndarray = high[1:last_id + 1]
+            middle_low: np.ndarray = low[1:last_id + 1]
+            is_top[1:] = (middle_high > high[:last_id]) & (middle_high > high[2:last_id + 2])
+            is_bottom[1:] = ~is_top[1:] & \
+                (middle_low < low[:last_id]) & (middle_low < low[2:last_id + 2])
+
+        # 测试：两个分型之间的合并K线的价格不能突破两个分型的极值。
+        # inner_low[k] / inner_high[k] 是 id 在 (k, right_id) 之间的合并K线的最低价/最高价。
+        inner_low: np.ndarray = np.minimum.accumulate(low[right_id - 1:0:-1])[::-1]
+        inner_high: np.ndarray = np.maximum.accumulate(high[right_id - 1:0:-1])[::-1]
+        inner_low = inner_low[:last_id + 1]
+        inner_high = inner_high[:last_id + 1]
+
+        mask: np.ndarray
+        if right_fractal_pattern == _TOP:
+            mask = is_bottom & (inner_low >= low[:last_id + 1]) & (inner_high <= high[right_id])
+        else:
+            mask = is_top & (inner_low >= low[right_id]) & (inner_high <= high[:last_id + 1])
+
+        candidates: np.ndarray = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return None
+        return int(candidates[0])
+
+    def _create_first_stroke(self,
+                             left_side_candle_left: Optional[MergedCandle],
+                             left_side_candle_middle: MergedCandle,
+                             left_side_candle_right: MergedCandle,
+                             left_fractal_pattern: FractalPattern,
+                             right_side_candle_left: MergedCandle,
+                             right_side_candle_middle: MergedCandle,
+                             right_fractal_pattern: FractalPattern,
+                             log_level: LogLevel
+                             ) -> Action:
+        """
+        Generate the first pair of fractals and the first stroke between them.
+
+        :return: Action.StrokeGenerated.
+        """
+        # Generate the first pair of fractals.
+        new_fractal: Fractal = Fractal(
+            id=self._fractals_count,
+            pattern=left_fractal_pattern,
+            left_candle=left_side_candle_left,
+            middle_candle=left_side_candle_middle,
+            right_candle=left_side_candle_right,
+            is_confirmed=True
+        )
+        self._append_fractal(new_fractal)
+        log_event_fractal_generated(
+            log_level=log_level,
+            new_element=new_fractal
+        )
+
+        new_fractal: Fractal = Fractal(
+            id=self._fractals_count,
+            pattern=right_fractal_pattern,
+            left_candle=right_side_candle_left,
+            middle_candle=right_side_candle_middle,
+            right_candle=None,
+            is_confirmed=False
+        )
+        self._append_fractal(new_fractal)
+        log_event_fractal_generated(
+            log_level=log_level,
+            new_element=new_fractal
+        )
+
+        # Generate the first stroke.
+        new_stroke: Stroke = Stroke(
+            id=self._strokes_count,
+            trend=_BULLISH if left_fractal_pattern == _BOTTOM else _BEARISH,
+            left_candle=left_side_candle_middle,
+            right_candle=right_side_candle_middle
+        )
+        self._append_stroke(new_stroke)
+        log_event_stroke_generated(
+            log_level=log_level,
+            new_element=new_stroke
+        )
+
+        return Action.StrokeGenerated
 
     def generate_following_stroke(self,
-                                  log_level: LogLevel = LogLevel.Normal
+                                  log_level: Optional[LogLevel] = None
                                   ) -> Action:
         """
         生成后续的笔以及分型。
@@ -434,6 +950,7 @@ class ChanTheoryDynamic(ChanTheory):
         # Declare variables and assign value.
         last_candle: MergedCandle = self._merged_candles[-1]
         last_stroke: Stroke = self._strokes[-1]
+        last_trend: int = self._stroke_trend[last_stroke.id]
 
         # log trying.
         log_try_to_generate_following_stroke(
@@ -443,23 +960,25 @@ class ChanTheoryDynamic(ChanTheory):
         )
 
         # Test: distance should be equal to or larger than the minimum distance.
-        distance = last_candle.id - last_stroke.right_candle.id
+        last_stroke_right_merged_id: int = self._last_stroke_right_merged_id
+        minimum_distance: int = self._minimum_distance
+        distance = last_candle.id - last_stroke_right_merged_id
 
         log_test_result_distance(
             log_level=log_level,
             distance=distance,
-            distance_required=self.minimum_distance
+            distance_required=minimum_distance
         )
 
-        if distance < self.minimum_distance:
+        if distance < minimum_distance:
             return Action.NothingChanged
 
         # Test: patterns of the two fractals should be different.
         left_fractal_pattern: FractalPattern
-        if last_stroke.trend == Trend.Bullish:
-            left_fractal_pattern = FractalPattern.Top
+        if last_trend == _TREND_BULL:
+            left_fractal_pattern = _TOP
         else:
-            left_fractal_pattern = FractalPattern.Bottom
+            left_fractal_pattern = _BOTTOM
 
         right_fractal_pattern: FractalPattern = is_fractal_pattern(
             left_candle=self._merged_candles[-2],
@@ -481,19 +1000,20 @@ class ChanTheoryDynamic(ChanTheory):
         # not reach or beyond the extreme price of the fractals.
         price_low: float
         price_high: float
-        if last_stroke.trend == Trend.Bullish:
+        if last_trend == _TREND_BULL:
             price_low = last_candle.low
             price_high = last_stroke.right_price
         else:
             price_low = last_stroke.right_price
             price_high = last_candle.high
 
+        merged_candles: List[MergedCandle] = self._merged_candles
         cursor_candle: MergedCandle
         result_candle: Optional[MergedCandle] = None
         is_price_break_high: bool = False
         is_price_break_low: bool = False
-        for j in range(last_stroke.right_merged_id + 1, last_candle.id):
-            cursor_candle = self.merged_candles[j]
+        for j in range(last_stroke_right_merged_id + 1, last_candle.id):
+            cursor_candle = merged_candles[j]
             if cursor_candle.low < price_low:
                 is_price_break_low = True
                 result_candle = cursor_candle
@@ -515,14 +1035,13 @@ class ChanTheoryDynamic(ChanTheory):
 
         # Generate new stroke.
         new_stroke: Stroke = Stroke(
-            id=self.strokes_count,
-            trend=Trend.Bullish if last_stroke.trend == Trend.Bearish
-            else Trend.Bearish,
+            id=self._strokes_count,
+            trend=_BULLISH if last_trend == _TREND_BEAR else _BEARISH,
             left_candle=last_stroke.right_candle,
             right_candle=last_candle,
         )
 
-        self._strokes.append(new_stroke)
+        self._append_stroke(new_stroke)
 
         log_event_stroke_generated(
             log_level=log_level,
@@ -532,7 +1051,7 @@ class ChanTheoryDynamic(ChanTheory):
         return Action.StrokeGenerated
 
     def extend_stroke(self,
-                      log_level: LogLevel = LogLevel.Normal
+                      log_level: Optional[LogLevel] = None
                       ) -> Action:
         """
         延伸笔，同时修正分型。
@@ -554,20 +1073,21 @@ class ChanTheoryDynamic(ChanTheory):
         # Declare variables and assign value.
         last_stroke: Stroke = self._strokes[-1]
         last_candle: MergedCandle = self._merged_candles[-1]
-        is_updated: bool = False
+        trend: int = int(self._stroke_trend[last_stroke.id])
+        right_price: float = last_stroke.right_price
 
         # log trying.
         log_try_to_update_stroke(log_level=log_level)
 
         # Test:
         # price of last candle reach or beyond the extreme price of the last fractal.
-        if last_stroke.trend == Trend.Bullish:
-            if last_candle.high >= last_stroke.right_price:
-                is_updated = True
-
-        else:  # last_stroke.trend == Trend.Bearish
-            if last_candle.low <= last_stroke.right_price:
-                is_updated = True
+        #     上升笔（trend = +1）：最新合并K线的最高价 - 笔的右侧价 >= 0，
+        #     下降笔（trend = -1）：笔的右侧价 - 最新合并K线的最低价 >= 0。
+        # 以 1 ± 趋势编码（0 或 2）作为权重，合并为一个表达式。
+        is_updated: bool = (
+            (last_candle.high - right_price) * (1 + trend) +
+            (right_price - last_candle.low) * (1 - trend)
+        ) >= 0
 
         log_test_result_price_break(
             log_level=log_level,
@@ -575,11 +1095,12 @@ class ChanTheoryDynamic(ChanTheory):
             candle=last_candle
         )
 
-        if is_updated is False:
+        if not is_updated:
             return Action.NothingChanged
 
         # Extend stroke.
         last_stroke.right_candle = last_candle
+        self._refresh_last_stroke()
 
         log_event_stroke_updated(
             log_level=log_level,
@@ -590,7 +1111,7 @@ class ChanTheoryDynamic(ChanTheory):
         return Action.StrokeExtended
 
     def generate_first_segment(self,
-                               log_level: LogLevel = LogLevel.Normal
+                               log_level: Optional[LogLevel] = None
                                ) -> Action:
         """
         Generate the first segments.
@@ -599,21 +1120,22 @@ class ChanTheoryDynamic(ChanTheory):
         # Handle parameter <log_level>.
         if log_level is None:
             log_level = self._log_level
+        is_detailed: bool = log_level >= LogLevel.Detailed
 
         # log trying.
         log_try_to_generate_first_segment(log_level=log_level)
 
         # Parameters validation.
-        if self.strokes_count == 0:
+        if self._strokes_count == 0:
             raise RuntimeError(
                 'No stroke data, run <generate_strokes> before this method.'
             )
 
         # 如果 笔数量 < 3： 退出。
-        if self.strokes_count < 3:
-            if log_level.value >= LogLevel.Detailed.value:
+        if self._strokes_count < 3:
+            if is_detailed:
                 print(
-                    f'\n  ○ 尝试生成线段：目前共有 {self.strokes_count} 根笔，最少需要 3 根。'
+                    f'\n  ○ 尝试生成线段：目前共有 {self._strokes_count} 根笔，最少需要 3 根。'
                 )
             return Action.NothingChanged
 
@@ -621,94 +1143,52 @@ class ChanTheoryDynamic(ChanTheory):
         right_stroke: Stroke = self._strokes[-1]    # 右侧笔
         middle_stroke: Stroke = self._strokes[-2]   # 中间笔
         left_stroke: Stroke = self._strokes[-3]     # 左侧笔
-        overlap_high: float     # 重叠区间高值
-        overlap_low: float      # 重叠区间低值
+        right_trend: int = self._stroke_trend[right_stroke.id]  # 右侧笔的趋势编码
+        right_high: float = self._stroke_high[right_stroke.id]  # 右侧笔的最高价
+        right_low: float = self._stroke_low[right_stroke.id]    # 右侧笔的最低价
+        left_high: float = self._stroke_high[left_stroke.id]    # 左侧笔的最高价
+        left_low: float = self._stroke_low[left_stroke.id]      # 左侧笔的最低价
 
-        if log_level.value >= LogLevel.Detailed.value:
+        if is_detailed:
             print(
-                f'\n  ○ 尝试生成首根线段：目前共有 {self.strokes_count} 根笔。\n'
+                f'\n  ○ 尝试生成首根线段：目前共有 {self._strokes_count} 根笔。\n'
                 f'    右侧笔，id = {right_stroke.id}，{right_stroke.trend.value}，'
-                f'high = {max(right_stroke.left_price, right_stroke.right_price)}，'
-                f'low = {min(right_stroke.left_price, right_stroke.right_price)}。\n'
+                f'high = {right_high}，'
+                f'low = {right_low}。\n'
                 f'    左侧笔，id = {left_stroke.id}，{left_stroke.trend.value}，'
-                f'high = {max(left_stroke.left_price, left_stroke.right_price)}，'
-                f'low = {min(left_stroke.left_price, left_stroke.right_price)}。'
+                f'high = {left_high}，'
+                f'low = {left_low}。'
             )
 
-        # 如果：
-        #     1. 右侧笔是上升笔，右侧笔的左侧价 < 左侧笔的左侧价，右侧笔的右侧价 < 左侧笔的左侧价
-        #   或者
-        #     2. 右侧笔是下降笔，右侧笔的左侧价 > 左侧笔的左侧价，右侧笔的右侧价 > 左侧笔的左侧价
-        # 无重叠。
-
-        if (
-                right_stroke.trend == Trend.Bullish and
-                right_stroke.left_price < left_stroke.left_price and
-                right_stroke.right_price < left_stroke.left_price
-        ) or (
-                right_stroke.trend == Trend.Bearish and
-                right_stroke.left_price > left_stroke.left_price and
-                right_stroke.right_price > left_stroke.left_price
-        ):
-            if log_level.value >= LogLevel.Detailed.value:
+        # 重叠区间，无论上升笔还是下降笔：
+        #     高点 = min(右侧笔的最高价, 左侧笔的最高价)，
+        #     低点 = max(右侧笔的最低价, 左侧笔的最低价)。
+        # 高点 < 低点 时无重叠。
+        overlap_high: float = right_high if right_high < left_high else left_high
+        overlap_low: float = right_low if right_low > left_low else left_low
+
+        if overlap_high < overlap_low:
+            if is_detailed:
                 print(
-                    f'        右侧笔的两个端点'
-                    f'（{right_stroke.left_price}, {right_stroke.right_price}）'
-                    f'均在左侧笔的左端点（{left_stroke.left_price}）一侧，无重叠。'
+                    f'        右侧笔的区间（{right_low}, {right_high}）'
+                    f'与左侧笔的区间（{left_low}, {left_high}）无重叠。'
                 )
             return Action.NothingChanged
 
-        # 如果：
-        #     1. 右侧笔是上升笔，且
-        #     2A. 右侧笔的左侧价 < 左侧笔的左侧价，右侧笔的右侧价 >= 左侧笔的左侧价
-        #       有重叠：
-        #       高点 = min(右侧笔的右侧价, 左侧笔的右侧价)，低点 = 左侧笔的左侧价
-        #
-        # A3. 右侧笔是上升笔，右侧笔的左侧价 >= 左侧笔的左侧价，右侧笔的右侧价 > 左侧笔的右侧价
-        #       有重叠：
-        #       高点 = min(右侧笔的右侧价, 左侧笔的左侧价)，低点 = 右侧笔的左侧价
-
-        if right_stroke.trend == Trend.Bullish:
-            if right_stroke.left_price < left_stroke.left_price <= right_stroke.right_price:
-                overlap_high = min(right_stroke.right_price, left_stroke.right_price)
-                overlap_low = left_stroke.left_price
-            elif right_stroke.left_price >= left_stroke.left_price:
-                overlap_high = min(right_stroke.right_price, left_stroke.right_price)
-                overlap_low = right_stroke.left_price
-            else:
-                raise RuntimeError('Unknown parameters in generating first segment (Bullish).')
-
-        # B2. 右侧笔是下降笔，右侧笔的左侧价 > 左侧笔的左侧价，右侧笔的右侧价 <= 左侧笔的右侧价
-        #       有重叠：
-        #       高点 = 左侧笔的左侧价，低点 = max(右侧笔的右侧价, 左侧笔的右侧价)
-        #
-        # B3. 右侧笔是下降笔，右侧笔的左侧价 <= 左侧笔的左侧价，右侧笔的右侧价 < 左侧笔的右侧价
-        #       有重叠：
-        #       高点 = 右侧笔的左侧价，低点 = max(右侧笔的右侧价, 左侧笔的左侧价)
-        else:
-            if right_stroke.left_price > right_stroke.left_price and \
-                    right_stroke.right_price <= left_stroke.right_price:
-                overlap_high = left_stroke.left_price
-                overlap_low = max(right_stroke.right_price, left_stroke.right_price)
-            elif right_stroke.left_price <= right_stroke.left_price:
-                overlap_high = right_stroke.left_price
-                overlap_low = max(right_stroke.right_price, left_stroke.left_price)
-            else:
-                raise RuntimeError('Unknown parameters in generating first segment (Bearish).')
-
-        if log_level.value >= LogLevel.Detailed.value:
+        if is_detailed:
             print(
                 f'        重叠区间 high = {overlap_high}，low = {overlap_low}，满足。'
             )
 
         new_segment: Segment = Segment(
-            id=self.segments_count,
-            trend=Trend.Bullish if right_stroke.trend == Trend.Bullish else Trend.Bearish,
+            id=self._segments_count,
+            trend=right_stroke.trend,
             left_candle=left_stroke.left_candle,
             right_candle=right_stroke.right_candle,
-            stroke_id_list=[left_stroke.id, middle_stroke.id, right_stroke.id]
+            left_stroke_id=left_stroke.id,
+            right_stroke_id=right_stroke.id
         )
-        self._segments.append(new_segment)
+        self._append_segment(new_segment)
 
         log_event_segment_generated(
             log_level=log_level,
@@ -718,7 +1198,7 @@ class ChanTheoryDynamic(ChanTheory):
         return Action.SegmentGenerated
 
     def extend_segment(self,
-                       log_level: LogLevel = LogLevel.Normal
+                       log_level: Optional[LogLevel] = None
                        ) -> Action:
         """
         Extend an existed segment.
@@ -729,18 +1209,10 @@ class ChanTheoryDynamic(ChanTheory):
 
         :return:
         """
-        verbose_message: Dict[str, str] = {
-            'extend_segment':
-                '\n  ○ 尝试延伸线段：最新线段 id = {segment_id}。'
-                '\n    线段右侧笔 id = {segment_stroke_id}，{segment_stroke_trend}，'
-                '右侧合并K线 id = {segment_right_candle_id}，右侧价 = {segment_right_price}。'
-                '\n    最新    笔 id = {stroke_id}，{stroke_trend}，'
-                '右侧合并K线 id = {stroke_right_candle_id}，右侧价 = {stroke_right_price}。',
-            'not_same_stroke':
-                '        笔 id（stroke_id） > 线段的右侧笔 id（segment_stroke_id），不满足。',
-            'pass':
-                '        笔 id 相同，趋势相同，笔右侧价 达到或超越 线段右侧价，满足。',
-        }
+        # Handle parameters.
+        if log_level is None:
+            log_level = self._log_level
+        is_detailed: bool = log_level >= LogLevel.Detailed
 
         # 申明变量类型并赋值。
         last_segment: Segment = self._segments[-1]
@@ -754,42 +1226,35 @@ class ChanTheoryDynamic(ChanTheory):
         #     B3. last_stroke 的最低价 <= last_segment 的右侧价 （顺向超越或达到）：
         # 延伸（调整）笔。
 
-        if log_level.value >= LogLevel.Detailed.value:
+        # 右侧价在判断和日志中共用，只取一次。
+        stroke_right_price: float = self._stroke_right[last_stroke.id]
+        segment_right_price: float = last_segment.right_price
+
+        if is_detailed:
             print(
-                verbose_message['extend_segment'].format(
-                    segment_id=last_segment.id,
-                    segment_stroke_id=last_segment.stroke_id_list[-1],
-                    segment_stroke_trend=last_segment.trend.value,
-                    segment_right_candle_id=last_segment.right_candle.id,
-                    segment_right_price=last_segment.right_price,
-                    stroke_id=last_stroke.id,
-                    stroke_trend=last_stroke.trend.value,
-                    stroke_right_candle_id=last_stroke.right_candle.id,
-                    stroke_right_price=last_stroke.right_price
-                )
+                f'\n  ○ 尝试延伸线段：最新线段 id = {last_segment.id}。'
+                f'\n    线段右侧笔 id = {last_segment.right_stroke_id}，'
+                f'{last_segment.trend.value}，'
+                f'右侧合并K线 id = {last_segment.right_candle.id}，'
+                f'右侧价 = {segment_right_price}。'
+                f'\n    最新    笔 id = {last_stroke.id}，{last_stroke.trend.value}，'
+                f'右侧合并K线 id = {last_stroke.right_candle.id}，'
+                f'右侧价 = {stroke_right_price}。'
             )
 
-        if last_stroke.id > last_segment.stroke_id_list[-1]:
-            if log_level.value >= LogLevel.Detailed.value:
+        if last_stroke.id > last_segment.right_stroke_id:
+            if is_detailed:
                 print(
-                    verbose_message['not_same_stroke'].format(
-                        stroke_id=last_stroke.id,
-                        segment_stroke_id=last_segment.stroke_id_list[-1]
-                    )
+                    f'        笔 id（{last_stroke.id}） > '
+                    f'线段的右侧笔 id（{last_segment.right_stroke_id}），不满足。'
                 )
             return Action.NothingChanged
 
-        if (
-                last_segment.trend == Trend.Bullish and
-                last_stroke.trend == Trend.Bullish and
-                last_stroke.right_price >= last_segment.right_price
-        ) or (
-                last_segment.trend == Trend.Bearish and
-                last_stroke.trend == Trend.Bearish and
-                last_stroke.right_price <= last_segment.right_price
-        ):
-            if log_level.value >= LogLevel.Detailed.value:
-                print(verbose_message['pass'])
+        segment_trend: int = self._segment_trend[last_segment.id]
+        stroke_trend: int = self._stroke_trend[last_stroke.id]
+        if _is_segment_extended(segment_trend, stroke_trend, stroke_right_price, segment_right_price):
+            if is_detailed:
+                print('        笔 id 相同，趋势相同，笔右侧价 达到或超越 线段右侧价，满足。')
 
             log_event_segment_extended(
                 log_level=log_level,
@@ -816,30 +1281,14 @@ class ChanTheoryDynamic(ChanTheory):
         :return:
         """
 
-        verbose_message: Dict[str, str] = {
-            'expand_segment':
-                '\n  ○ 尝试扩张线段：最新线段 id = {segment_id}。'
-                '\n    线段右侧笔 id = {segment_stroke_id}，{segment_stroke_trend}，'
-                '右侧合并K线 id = {segment_right_candle_id}，右侧价 = {segment_right_price}。'
-                '\n    最新    笔 id = {stroke_id}，{stroke_trend}，'
-                '右侧合并K线 id = {stroke_right_candle_id}，右侧价 = {stroke_right_price}。',
-            'not_same_trend':
-                '        最新笔的趋势 与 线段右侧笔的趋势 不同，不满足。',
-            'same_trend':
-                '        最新笔的趋势 与 线段右侧笔的趋势 相同，满足。',
-            'not_achieve_or_beyond':
-                '        最新笔的右侧价 没有达到或超越 线段的右侧价，不满足。',
-            'achieve_or_beyond':
-                '        最新笔的右侧价 达到或超越 线段的右侧价，满足。',
-        }
-
         # Handle parameters.
         if log_level is None:
             log_level = self._log_level
+        is_detailed: bool = log_level >= LogLevel.Detailed
 
         # 申明变量类型并赋值。
         last_segment: Segment = self._segments[-1]
-        right_stroke_in_last_segment: Stroke = self._strokes[last_segment.stroke_id_list[-1]]
+        right_stroke_in_last_segment: Stroke = self._strokes[last_segment.right_stroke_id]
         last_stroke: Stroke = self._strokes[-1]
 
         # 如果：
@@ -850,64 +1299,58 @@ class ChanTheoryDynamic(ChanTheory):
         #     B3. last_stroke 的最低价 <= last_segment 的右侧价 （顺向超越或达到）：
         # 延伸（调整）线段。
 
-        if log_level.value >= LogLevel.Detailed.value:
+        # 最新笔的右侧价在判断和日志中共用，只取一次。
+        stroke_right_price: float = self._stroke_right[last_stroke.id]
+
+        if is_detailed:
             print(
-                verbose_message['expand_segment'].format(
-                    segment_id=last_segment.id,
-                    segment_stroke_id=last_segment.stroke_id_list[-1],
-                    segment_stroke_trend=last_segment.trend.value,
-                    segment_right_candle_id=last_segment.right_candle.id,
-                    segment_right_price=last_segment.right_price,
-                    stroke_id=last_stroke.id,
-                    stroke_trend=last_stroke.trend.value,
-                    stroke_right_candle_id=last_stroke.right_candle.id,
-                    stroke_right_price=last_stroke.right_price
-                )
+                f'\n  ○ 尝试扩张线段：最新线段 id = {last_segment.id}。'
+                f'\n    线段右侧笔 id = {last_segment.right_stroke_id}，'
+                f'{last_segment.trend.value}，'
+                f'右侧合并K线 id = {last_segment.right_candle.id}，'
+                f'右侧价 = {last_segment.right_price}。'
+                f'\n    最新    笔 id = {last_stroke.id}，{last_stroke.trend.value}，'
+                f'右侧合并K线 id = {last_stroke.right_candle.id}，'
+                f'右侧价 = {stroke_right_price}。'
             )
 
-        if last_stroke.trend != right_stroke_in_last_segment.trend:
-            if log_level.value >= LogLevel.Detailed.value:
-                print(verbose_message['not_same_trend'])
+        stroke_trend: int = self._stroke_trend[last_stroke.id]
+        if stroke_trend != self._stroke_trend[right_stroke_in_last_segment.id]:
+            if is_detailed:
+                print('        最新笔的趋势 与 线段右侧笔的趋势 不同，不满足。')
             return Action.NothingChanged
         else:
-            if log_level.value >= LogLevel.Detailed.value:
-                print(verbose_message['same_trend'])
-
-        if (
-                last_stroke.trend == Trend.Bullish and
-                last_stroke.right_price >= right_stroke_in_last_segment.right_price
-        ) or (
-                last_stroke.trend == Trend.Bearish and
-                last_stroke.right_price <= right_stroke_in_last_segment.right_price
-        ):
+            if is_detailed:
+                print('        最新笔的趋势 与 线段右侧笔的趋势 相同，满足。')
+
+        # 价格从笔的列中读取。
+        segment_right_price: float = self._stroke_right[right_stroke_in_last_segment.id]
+        if _is_segment_extended(stroke_trend, stroke_trend, stroke_right_price, segment_right_price):
 
-            if log_level.value >= LogLevel.Detailed.value:
-                print(verbose_message['achieve_or_beyond'])
+            if is_detailed:
+                print('        最新笔的右侧价 达到或超越 线段的右侧价，满足。')
 
             log_event_segment_expanded(
                 log_level=log_level,
                 element=last_segment,
                 stroke=last_stroke,
-                new_strokes=[
-                    i for i in range(
-                        last_segment.stroke_id_list[-1] + 1,
-                        last_stroke.id + 1
-                    )
-                ]
+                new_strokes=list(range(
+                    last_segment.right_stroke_id + 1,
+                    last_stroke.id + 1
+                ))
             )
 
-            for i in range(last_segment.stroke_id_list[-1] + 1, last_stroke.id + 1):
-                last_segment.stroke_id_list.append(i)
+            last_segment.right_stroke_id = last_stroke.id
             last_segment.right_candle = last_stroke.right_candle
 
             return Action.SegmentExpanded
 
-        if log_level.value >= LogLevel.Detailed.value:
-            print(verbose_message['not_achieve_or_beyond'])
+        if is_detailed:
+            print('        最新笔的右侧价 没有达到或超越 线段的右侧价，不满足。')
         return Action.NothingChanged
 
     def generate_following_segment(self,
-                                   log_level: LogLevel = LogLevel.Normal
+                                   log_level: Optional[LogLevel] = None
                                    ) -> Action:
         """
         Generate the following segment reversely.
@@ -917,30 +1360,41 @@ class ChanTheoryDynamic(ChanTheory):
         # Handle parameter <log_level>.
         if log_level is None:
             log_level = self._log_level
+        is_detailed: bool = log_level >= LogLevel.Detailed
 
         last_segment: Segment = self._segments[-1]
-        last_stroke_in_segment: Stroke = self._strokes[last_segment.stroke_id_list[-1]]
+        last_stroke_in_segment: Stroke = self._strokes[last_segment.right_stroke_id]
 
         left_stroke: Stroke = self._strokes[-3]
         middle_stroke: Stroke = self._strokes[-2]
         right_stroke: Stroke = self._strokes[-1]
 
-        if log_level.value >= LogLevel.Detailed.value:
+        segment_trend: int = self._segment_trend[last_segment.id]
+        right_trend: int = self._stroke_trend[right_stroke.id]
+
+        # 价格从笔的列中读取，判断和日志共用。
+        left_left_price: float = self._stroke_left[left_stroke.id]
+        left_right_price: float = self._stroke_right[left_stroke.id]
+        right_left_price: float = self._stroke_left[right_stroke.id]
+        right_right_price: float = self._stroke_right[right_stroke.id]
+        segment_left_price: float = self._stroke_left[last_stroke_in_segment.id]
+
+        if is_detailed:
             print(
                 f'\n  ○ 尝试生成反向线段：'
-                f'目前共有线段 {self.segments_count} 根，笔 {self.strokes_count} 根。\n'
+                f'目前共有线段 {self._segments_count} 根，笔 {self._strokes_count} 根。\n'
                 f'    最新线段的右侧笔 id = {last_stroke_in_segment.id}，'
                 f'trend = {last_stroke_in_segment.trend}，'
                 f'price left = {last_segment.left_price}，'
                 f'price right = {last_segment.right_price}\n'
                 f'    最新3根笔的左侧笔 id = {left_stroke.id}，'
                 f'trend = {left_stroke.trend}，'
-                f'price left = {left_stroke.left_price}，'
-                f'price right = {left_stroke.right_price}\n'
+                f'price left = {left_left_price}，'
+                f'price right = {left_right_price}\n'
                 f'    最新3根笔的右侧笔 id = {right_stroke.id}，'
                 f'trend = {right_stroke.trend}，'
-                f'price left = {right_stroke.left_price}，'
-                f'price right = {right_stroke.right_price}'
+                f'price left = {right_left_price}，'
+                f'price right = {right_right_price}'
             )
 
         # 如果：
@@ -964,34 +1418,24 @@ class ChanTheoryDynamic(ChanTheory):
         #         B. 左侧笔的右侧价 > 线段内右侧笔的左侧价
         #            （创线段内右侧笔的新高）
         # 生成反向线段。
-        if (
-                last_segment.trend == Trend.Bullish and
-                right_stroke.trend == Trend.Bearish and
-                right_stroke.left_price < left_stroke.left_price and
-                (
-                        right_stroke.right_price <= left_stroke.right_price
-                        or
-                        left_stroke.right_price < last_stroke_in_segment.left_price
-                )
-        ) or (
-                last_segment.trend == Trend.Bearish and
-                right_stroke.trend == Trend.Bullish and
-                right_stroke.left_price > left_stroke.left_price and
-                (
-                        right_stroke.right_price >= left_stroke.right_price
-                        or
-                        left_stroke.right_price > last_stroke_in_segment.left_price
-                )
+        if _is_segment_reversed(
+                segment_trend,
+                right_trend,
+                left_left_price,
+                left_right_price,
+                right_left_price,
+                right_right_price,
+                segment_left_price
         ):
             new_segment = Segment(
-                id=self.segments_count,
-                trend=Trend.Bullish
-                if right_stroke.trend == Trend.Bullish else Trend.Bearish,
+                id=self._segments_count,
+                trend=right_stroke.trend,
                 left_candle=left_stroke.left_candle,
                 right_candle=right_stroke.right_candle,
-                stroke_id_list=[left_stroke.id, middle_stroke.id, right_stroke.id]
+                left_stroke_id=left_stroke.id,
+                right_stroke_id=right_stroke.id
             )
-            self._segments.append(new_segment)
+            self._append_segment(new_segment)
 
             log_event_segment_generated(
                 log_level=log_level,
@@ -1003,40 +1447,48 @@ class ChanTheoryDynamic(ChanTheory):
         return Action.NothingChanged
 
     def generate_gap_segment(self,
-                             log_level: LogLevel = LogLevel.Normal
+                             log_level: Optional[LogLevel] = None
                              ) -> Action:
         # Handle parameter <log_level>.
         if log_level is None:
             log_level = self._log_level
+        is_detailed: bool = log_level >= LogLevel.Detailed
 
         last_segment: Segment = self._segments[-1]
-        last_stroke_in_segment: Stroke = self._strokes[last_segment.stroke_id_list[-1]]
+        last_stroke_in_segment: Stroke = self._strokes[last_segment.right_stroke_id]
 
         stroke_right: Stroke = self._strokes[-1]
         stroke_left: Stroke = self._strokes[-3]
+        right_trend: int = self._stroke_trend[stroke_right.id]
 
-        delta: int = stroke_right.id - last_segment.stroke_id_list[-1]
+        delta: int = stroke_right.id - last_segment.right_stroke_id
         if delta % 2 == 0:
             action = self.expand_segment()
             if action == Action.SegmentExpanded:
                 return Action.SegmentExpanded
 
-        if log_level.value >= LogLevel.Detailed.value:
+        # 价格从笔的列中读取，判断和日志共用。
+        left_left_price: float = self._stroke_left[stroke_left.id]
+        left_right_price: float = self._stroke_right[stroke_left.id]
+        right_left_price: float = self._stroke_left[stroke_right.id]
+        right_right_price: float = self._stroke_right[stroke_right.id]
+
+        if is_detailed:
             print(
                 f'\n  ○ 尝试生成跳空线段：'
-                f'目前共有线段 {self.segments_count} 根，笔 {self.strokes_count} 根。\n'
+                f'目前共有线段 {self._segments_count} 根，笔 {self._strokes_count} 根。\n'
                 f'    最新线段的最新笔 id = {last_stroke_in_segment.id}，'
                 f'trend = {last_stroke_in_segment.trend}，'
                 f'price left = {last_segment.left_price}，'
                 f'price right = {last_segment.right_price}\n'
                 f'    向向左第1笔 id = {stroke_right.id}，'
                 f'trend = {stroke_right.trend}，'
-                f'price left = {stroke_right.left_price}，'
-                f'price right = {stroke_right.right_price}\n'
+                f'price left = {right_left_price}，'
+                f'price right = {right_right_price}\n'
                 f'    向向左第3笔 id = {stroke_left.id}，'
                 f'trend = {stroke_left.trend}，'
-                f'price left = {stroke_left.left_price}，'
-                f'price right = {stroke_left.right_price}'
+                f'price left = {left_left_price}，'
+                f'price right = {left_right_price}'
             )
 
         # 如果：
@@ -1048,36 +1500,31 @@ class ChanTheoryDynamic(ChanTheory):
         #     B2. stroke_right 的 左侧价 <= stroke_left 的 左侧价，且
         #     B3. stroke_right 的 右侧价 < stroke_left 的 右侧价
         # 生成跳空线段。
-        if (
-                stroke_right.trend == Trend.Bullish and
-                stroke_right.left_price >= stroke_left.left_price and
-                stroke_right.right_price > stroke_left.right_price
-        ) or (
-                stroke_right.trend == Trend.Bearish and
-                stroke_right.left_price <= stroke_left.left_price and
-                stroke_right.right_price < stroke_left.right_price
+        if _is_gap_segment(
+                right_trend,
+                left_left_price,
+                left_right_price,
+                right_left_price,
+                right_right_price
         ):
             new_segment: Segment
 
             # 如果 stroke_right 与 last_segment 同向：
-            if stroke_right.trend == last_segment.trend:
+            if right_trend == self._segment_trend[last_segment.id]:
                 # 如果 stroke_left 的 id 与 last_segment 的右侧笔的 id 相差 2：
                 # 延伸 last_segment
                 log_event_segment_expanded(
                     log_level=log_level,
                     element=last_segment,
                     stroke=stroke_right,
-                    new_strokes=[
-                        i for i in range(
-                            last_segment.stroke_id_list[-1] + 1,
-                            stroke_right.id + 1
-                        )
-                    ]
+                    new_strokes=list(range(
+                        last_segment.right_stroke_id + 1,
+                        stroke_right.id + 1
+                    ))
                 )
                 if stroke_left.id - last_stroke_in_segment.id == 2:
-                    for i in range(last_segment.stroke_id_list[-1] + 1, stroke_right.id + 1):
-                        last_segment.stroke_id_list.append(i)
-                    last_segment.right_stroke = stroke_right
+                    last_segment.right_stroke_id = stroke_right.id
+                    last_segment.right_candle = stroke_right.right_candle
 
                     return Action.SegmentGenerated
 
@@ -1085,16 +1532,14 @@ class ChanTheoryDynamic(ChanTheory):
                 # 补一根反向线段，起点是 last_segment 的右端点，终点是 stroke_left 的左端点。
                 else:
                     new_segment = Segment(
-                        id=self.segments_count,
-                        trend=Trend.Bearish
-                        if stroke_right.trend == Trend.Bullish else Trend.Bullish,
+                        id=self._segments_count,
+                        trend=_BEARISH if right_trend == _TREND_BULL else _BULLISH,
                         left_candle=last_segment.right_candle,
                         right_candle=stroke_left.left_candle,
-                        stroke_id_list=[
-                            i for i in range(last_stroke_in_segment.id + 1, stroke_left.id)
-                        ]
+                        left_stroke_id=last_stroke_in_segment.id + 1,
+                        right_stroke_id=stroke_left.id - 1
                     )
-                    self._segments.append(new_segment)
+                    self._append_segment(new_segment)
 
                     log_event_segment_generated(
                         log_level=log_level,
@@ -1104,16 +1549,14 @@ class ChanTheoryDynamic(ChanTheory):
             # 如果 stroke_right 与 last_segment 反向：
             else:
                 new_segment = Segment(
-                    id=self.segments_count,
-                    trend=Trend.Bullish
-                    if stroke_right.trend == Trend.Bullish else Trend.Bearish,
+                    id=self._segments_count,
+                    trend=stroke_right.trend,
                     left_candle=last_segment.right_candle,
                     right_candle=stroke_right.right_candle,
-                    stroke_id_list=[
-                        i for i in range(last_stroke_in_segment.id + 1, stroke_right.id + 1)
-                    ]
+                    left_stroke_id=last_stroke_in_segment.id + 1,
+                    right_stroke_id=stroke_right.id
                 )
-                self._segments.append(new_segment)
+                self._append_segment(new_segment)
 
                 log_event_segment_generated(
                     log_level=log_level,
@@ -1136,26 +1579,26 @@ class ChanTheoryDynamic(ChanTheory):
         #     向前穷举 stroke_p3，如果：
         #         stroke_p3 和 stroke_p1 有重叠：
         #   生成线段。
-        if self.segments_count == 0:
+        if self._segments_count == 0:
 
             self.generate_first_segment()
 
         # 如果 线段数量 >= 1：
         else:
-            last_segment: Segment = self._segments[-1]
-            last_stroke_in_segment: Stroke = self._strokes[last_segment.stroke_id_list[-1]]
-            last_stroke: Stroke = self._strokes[-1]
+            # 最新笔的 id - 最新线段的右侧笔的 id，各分支共用。
+            # 笔的 id 与其在列表中的下标相同，最新笔的 id 即 笔的数量 - 1。
+            delta: int = self._strokes_count - 1 - self._segments[-1].right_stroke_id
 
-            if last_stroke.id - last_stroke_in_segment.id < 2:
+            if delta < 2:
                 pass
 
             # 在 最新笔的 id - 最新线段的右侧笔的 id == 2 时：
-            elif last_stroke.id - last_segment.stroke_id_list[-1] == 2:
+            elif delta == 2:
 
                 self.extend_segment()
 
             # 在 最新笔的 id - 最新线段的右侧笔的 id == 3 时：
-            elif last_stroke.id - last_stroke_in_segment.id == 3:
+            elif delta == 3:
                 self.generate_following_segment()
 
             # 在 最新笔的 id - 最新线段的右侧笔的 id > 3 时：
@@ -1168,7 +1611,7 @@ class ChanTheoryDynamic(ChanTheory):
         return False
 
     def generate_isolation_line(self,
-                                log_level: LogLevel = LogLevel.Normal
+                                log_level: Optional[LogLevel] = None
                                 ) -> None:
         """
         Generate the stroke pivots.
@@ -1184,24 +1627,25 @@ class ChanTheoryDynamic(ChanTheory):
         log_try_to_generate_isolation_line(log_level=log_level)
 
         # Parameters validation.
-        if self.strokes_count == 0:
+        if self._strokes_count == 0:
             raise RuntimeError(
                 'No stroke data, run <generate_strokes> before.'
             )
 
         last_segment: Segment = self._segments[-1]
         new_isolation_line: IsolationLine = IsolationLine(
-            id=self.isolation_lines_count,
+            id=self._isolation_lines_count,
             candle=last_segment.left_candle
         )
         self._isolation_lines.append(new_isolation_line)
+        self._isolation_lines_count += 1
         log_event_isolation_line_generated(
             log_level=log_level,
             new_element=new_isolation_line
         )
 
     def generate_stroke_pivot(self,
-                              log_level: LogLevel = LogLevel.Normal
+                              log_level: Optional[LogLevel] = None
                               ) -> bool:
         """
         Generate the stroke pivots.
@@ -1213,30 +1657,31 @@ class ChanTheoryDynamic(ChanTheory):
         # Handle parameter <log_level>.
         if log_level is None:
             log_level = self._log_level
+        is_detailed: bool = log_level >= LogLevel.Detailed
 
         # Log trying.
         log_try_to_generate_stroke_pivot(log_level=log_level)
 
         # Parameters validation.
-        if self.strokes_count == 0:
+        if self._strokes_count == 0:
             raise RuntimeError(
                 'No stroke data, run <generate_strokes> before.'
             )
 
         last_segment: Segment = self._segments[-1]
         if last_segment.strokes_count <= 3:
-            if log_level.value >= LogLevel.Detailed.value:
+            if is_detailed:
                 print(f'\n  ○ 尝试生成笔中枢：当前线段仅包含3根笔。')
             return False
 
-        stroke_2_id: int = last_segment.stroke_id_list[1]
+        stroke_2_id: int = last_segment.left_stroke_id + 1
         stroke_2: Stroke = self._strokes[stroke_2_id]
-        stroke_3_id: int = last_segment.stroke_id_list[2]
+        stroke_3_id: int = last_segment.left_stroke_id + 2
         stroke_3: Stroke = self._strokes[stroke_3_id]
-        stroke_4_id: int = last_segment.stroke_id_list[3]
+        stroke_4_id: int = last_segment.left_stroke_id + 3
         stroke_4: Stroke = self._strokes[stroke_4_id]
         
-        if log_level.value >= LogLevel.Detailed.value:
+        if is_detailed:
             print(
                 f'\n  ○ 尝试生成笔中枢：当前线段包含 {last_segment.strokes_count} 根笔。'
                 f'\n    最新线段的第2笔 id = {stroke_2_id}，trend = {stroke_2.trend.value}，'
@@ -1250,81 +1695,89 @@ class ChanTheoryDynamic(ChanTheory):
         overlap_high: float    # 重叠区间高值
         overlap_low: float     # 重叠区间低值
 
+        # 下面的判断和日志反复使用这四个价格，只取一次。
+        stroke_2_left_price: float = stroke_2.left_price
+        stroke_2_right_price: float = stroke_2.right_price
+        stroke_4_left_price: float = stroke_4.left_price
+        stroke_4_right_price: float = stroke_4.right_price
+
         # 如果 stroke_2 是上升笔，且，stroke_4 是上升笔：
-        if stroke_2.trend == Trend.Bullish and stroke_4.trend == Trend.Bullish:
+        stroke_2_trend: int = self._stroke_trend[stroke_2_id]
+        stroke_4_trend: int = self._stroke_trend[stroke_4_id]
+        if stroke_2_trend == _TREND_BULL and stroke_4_trend == _TREND_BULL:
 
             # 如果 stroke_4 的右侧价 < stroke_2 的左侧价：
-            if stroke_4.left_price < stroke_2.left_price:
+            if stroke_4_left_price < stroke_2_left_price:
                 # 如果
                 #     1. stroke_4 的右侧价 < stroke_2 的左侧价
                 # 没有重叠
-                if stroke_4.right_price < stroke_2.left_price:
-                    if log_level.value >= LogLevel.Detailed.value:
+                if stroke_4_right_price < stroke_2_left_price:
+                    if is_detailed:
                         print(
                             f'上升笔，'
-                            f'第4笔的右侧价（{stroke_4.right_price}）'
+                            f'第4笔的右侧价（{stroke_4_right_price}）'
                             f' < '
-                            f'第2笔的左侧价（{stroke_2.left_price}），'
+                            f'第2笔的左侧价（{stroke_2_left_price}），'
                             f'没有重叠。'
                         )
                     return False
 
                 # 其他情况（stroke_4 的右侧价 >= stroke_2 的左侧价）
                 else:
-                    overlap_high = min(stroke_2.right_price, stroke_4.right_price)
-                    overlap_low = stroke_2.left_price
+                    overlap_high = min(stroke_2_right_price, stroke_4_right_price)
+                    overlap_low = stroke_2_left_price
 
             # 如果 stroke_2 的左侧价 <= stroke_4 的左侧价 < stroke_2 的右侧价：
-            elif stroke_2.left_price <= stroke_4.left_price < stroke_2.right_price:
-                overlap_high = min(stroke_2.right_price, stroke_4.right_price)
-                overlap_low = stroke_4.left_price
+            elif stroke_2_left_price <= stroke_4_left_price < stroke_2_right_price:
+                overlap_high = min(stroke_2_right_price, stroke_4_right_price)
+                overlap_low = stroke_4_left_price
 
             # 如果 stroke_4.left_price >= stroke_2.right_price
             else:
-                if log_level.value >= LogLevel.Detailed.value:
+                if is_detailed:
                     print(
                         '出错了！\n'
-                        f'第4笔的左侧价（{stroke_4.left_price}）'
+                        f'第4笔的左侧价（{stroke_4_left_price}）'
                         f' >= '
-                        f'第2笔的右侧价（{stroke_2.right_price}）。'
+                        f'第2笔的右侧价（{stroke_2_right_price}）。'
                     )
                 return False
 
         # 如果 stroke_2 是下降笔，且，stroke_4 是下降笔：
-        elif stroke_2.trend == Trend.Bearish and stroke_4.trend == Trend.Bearish:
+        elif stroke_2_trend == _TREND_BEAR and stroke_4_trend == _TREND_BEAR:
 
             # 如果 stroke_4 的左侧价 > stroke_2 的左侧价：
-            if stroke_4.left_price > stroke_2.left_price:
+            if stroke_4_left_price > stroke_2_left_price:
                 # 如果
                 #     1. stroke_4 的右侧价 > stroke_2 的左侧价
                 # 没有重叠
-                if stroke_4.right_price > stroke_2.left_price:
-                    if log_level.value >= LogLevel.Detailed.value:
+                if stroke_4_right_price > stroke_2_left_price:
+                    if is_detailed:
                         print(
                             f'下降笔，'
-                            f'第4笔的右侧价（{stroke_4.right_price}）'
+                            f'第4笔的右侧价（{stroke_4_right_price}）'
                             f' > '
-                            f'第2笔的左侧价（{stroke_2.left_price}），'
+                            f'第2笔的左侧价（{stroke_2_left_price}），'
                             f'没有重叠。'
                         )
                     return False
                 else:
-                    overlap_high = stroke_2.left_price
-                    overlap_low = max(stroke_2.right_price, stroke_4.right_price)
+                    overlap_high = stroke_2_left_price
+                    overlap_low = max(stroke_2_right_price, stroke_4_right_price)
 
             # 如果 stroke_2 的右侧价 <= stroke_4 的左侧价 < stroke_2 的左侧价：
-            elif stroke_2.right_price <= stroke_4.left_price < stroke_2.left_price:
-                overlap_high = stroke_4.left_price
-                overlap_low = max(stroke_2.right_price, stroke_4.right_price)
+            elif stroke_2_right_price <= stroke_4_left_price < stroke_2_left_price:
+                overlap_high = stroke_4_left_price
+                overlap_low = max(stroke_2_right_price, stroke_4_right_price)
 
             # 如果 stroke_4.left_price <= stroke_2.right_price
             else:
-                if log_level.value >= LogLevel.Detailed.value:
+                if is_detailed:
                     print(
                         '出错了！\n'
-                        f'第4笔的左侧价（{stroke_4.left_price}）'
+                        f'第4笔的左侧价（{stroke_4_left_price}）'
                         f' <= '
-                        f'第2笔的右侧价（{stroke_2.right_price}）。'
+                        f'第2笔的右侧价（{stroke_2_right_price}）。'
                     )
                 return False
 
@@ -1332,25 +1785,26 @@ class ChanTheoryDynamic(ChanTheory):
         #     stroke_2 的趋势和 stroke_4 的不同：
         # 出错了。
         else:
-            if log_level.value >= LogLevel.Detailed.value:
+            if is_detailed:
                 print(
                     f'第2笔的趋势（{stroke_2.trend.value}）和第4笔的趋势（{stroke_4.trend.value}）不同。'
                 )
             return False
 
-        if log_level.value >= LogLevel.Detailed.value:
+        if is_detailed:
             print(
                 f'        重叠区域 high = {overlap_high}，low = {overlap_low}。'
             )
 
         new_stroke_pivots: Pivot = Pivot(
-            id=self.stroke_pivots_count,
+            id=self._stroke_pivots_count,
             left_candle=stroke_2.left_candle,
             right_candle=stroke_4.right_candle,
             high=overlap_high,
             low=overlap_low
         )
         self._stroke_pivots.append(new_stroke_pivots)
+        self._stroke_pivots_count += 1
 
         log_event_stroke_pivot_generated(
             log_level=log_level,
@@ -1370,27 +1824,45 @@ class ChanTheoryDynamic(ChanTheory):
         :param low:  float, the low price of new candle.
         :return: None.
         """
-        action: Action
-
         # --------------------
         # 关于 合并K线
         # --------------------
-        ordinary_candle: OrdinaryCandle = OrdinaryCandle(
-            high=high,
-            low=low
+        # 直接用价格列按 merge_candle_prices（未编译版本）合并，不再为每根普通K线创建 OrdinaryCandle。
+        count: int = self._merged_candles_count
+        is_new: int
+        merged_high: float
+        merged_low: float
+        is_new, merged_high, merged_low = _merge_candle_prices_py(
+            count,
+            self._mc_high[count - 2] if count >= 2 else 0.0,
+            self._mc_low[count - 2] if count >= 2 else 0.0,
+            self._mc_high[count - 1] if count >= 1 else 0.0,
+            self._mc_low[count - 1] if count >= 1 else 0.0,
+            high,
+            low
         )
-
-        action = self.update_merged_candle(ordinary_candle)
+        if is_new < 0:
+            # 两根合并K线高低关系出错，交给 update_merged_candle 处理（并抛出异常）。
+            self.update_merged_candle(OrdinaryCandle(high=high, low=low))
+            return
 
         # 如果 不是 生成新的合并K线，返回。
-        if action != Action.MergedCandleGenerated:
+        if self._apply_merged_candle(is_new, float(merged_high), float(merged_low)) != Action.MergedCandleGenerated:
             return
 
+        self._run_after_merged_candle_generated()
+
+    def _run_after_merged_candle_generated(self) -> None:
+        """
+        Update strokes and segments, after a new merged candle was generated.
+
+        :return: None.
+        """
         # --------------------
         # 关于 笔
         # --------------------
         # 如果 笔的数量 == 0：
-        if self.strokes_count == 0:
+        if self._strokes_count == 0:
             # 尝试生成首根笔（同时生成第1、第2个分型）。
             self.generate_first_stroke()
 
@@ -1399,45 +1871,39 @@ class ChanTheoryDynamic(ChanTheory):
             return
 
         # 如果 笔的数量 > 0，尝试延伸笔（同时修正分型）。
-        else:
-            action = self.extend_stroke()
-
-            # 如果 延伸笔 没有成功，尝试生成反向笔。
-            if action != Action.StrokeExtended:
-                self.generate_following_stroke()
+        # 如果 延伸笔 没有成功，尝试生成反向笔。
+        if self.extend_stroke() != Action.StrokeExtended:
+            self.generate_following_stroke()
 
-            # 无论 延伸笔 或者 生成反向笔 的结果是成功或者失败，
-            # 都需要根据线段的数量判定下一步。
+        # 无论 延伸笔 或者 生成反向笔 的结果是成功或者失败，
+        # 都需要根据线段的数量判定下一步。
 
         # --------------------
         # 关于 线段
         # --------------------
         # 如果线段的数量 == 0，尝试生成首根线段。
-        if self.segments_count == 0:
+        if self._segments_count == 0:
             self.generate_first_segment()
             # 即使生成了新的线段，线段的数量也就是1根，不足以进一步计算。
             # 返回。
             return
 
         # 如果线段的数量 > 0，尝试扩张线段。
+        # 最新笔id 与 最新线段内右侧笔id 的距离。
+        delta = self._strokes_count - 1 - self._segments[-1].right_stroke_id
+        if self._log_level >= LogLevel.Detailed:
+            print(f'\n  ○ 笔和线段右侧笔 id Delta = {delta}')
+
+        if delta == 0:
+            self.extend_segment()   # 最新合并K线 id > 最新线段右侧合并K线 id ?
+        elif delta == 1:
+            pass
+        elif delta == 2:
+            self.expand_segment()
+        elif delta == 3:
+            self.generate_following_segment()
         else:
-            last_stroke: Stroke = self._strokes[-1]
-            last_segment: Segment = self._segments[-1]
-
-            # 最新笔id 与 最新线段内右侧笔id 的距离。
-            delta = last_stroke.id - last_segment.stroke_id_list[-1]
-            print('笔和线段右侧笔 id Delta = ', delta)
-
-            if delta == 0:
-                self.extend_segment()   # 最新合并K线 id > 最新线段右侧合并K线 id ?
-            elif delta == 1:
-                pass
-            elif delta == 2:
-                self.expand_segment()
-            elif delta == 3:
-                self.generate_following_segment()
-            else:
-                self.generate_gap_segment()
+            self.generate_gap_segment()
 
     def run_with_dataframe(self,
                            df: pd.DataFrame,
@@ -1461,20 +1927,98 @@ class ChanTheoryDynamic(ChanTheory):
         if count is None or count <= 0 or count > len(df):
             count = len(df)
 
-        width: int = len(str(count - 1)) + 1
+        # 一次性取出价格列，逐行的 df.iloc[idx] 会为每根K线构造一个 Series。
+        self.run_with_ndarray(
+            high=df['high'].to_numpy(dtype=np.float64)[:count],
+            low=df['low'].to_numpy(dtype=np.float64)[:count],
+            log_level=log_level
+        )
+
+    def run_with_ndarray(self,
+                         high: np.ndarray,
+                         low: np.ndarray,
+                         log_level: Optional[LogLevel] = None
+                         ) -> None:
+        """
+        Run with lots of data in numpy ndarray format.
+
+        The prices are converted to Python float once before the loop, so no pandas or numpy
+        indexing happens for each bar.
+
+        :param high:      numpy ndarray. A series of high prices.
+        :param low:       numpy ndarray. A series of low prices, the same length as <high>.
+        :param log_level:
+        :return: None.
+        """
+
+        # Handle parameters.
+        if log_level is None:
+            log_level = self._log_level
+
+        # Parameters validation.
+        if len(high) != len(low):
+            raise ValueError('<high> and <low> should have the same length.')
+
+        count: int = len(high)
+        # 复制为可写的连续数组（pandas 给出的视图可能是只读的）。
+        high_array: np.ndarray = np.array(high, dtype=np.float64)
+        low_array: np.ndarray = np.array(low, dtype=np.float64)
+
+        # 合并K线只取决于普通K线，先一次算出每根普通K线之后最新合并K线的状态。
+        is_new_array: np.ndarray = np.empty(count, dtype=np.int8)
+        merged_high_array: np.ndarray = np.empty(count, dtype=np.float64)
+        merged_low_array: np.ndarray = np.empty(count, dtype=np.float64)
+        merged_count: int = self._merged_candles_count
+        resolved_count: int = merge_candles(
+            high_array,
+            low_array,
+            is_new_array,
+            merged_high_array,
+            merged_low_array,
+            merged_count,
+            self._mc_high[merged_count - 2] if merged_count >= 2 else 0.0,
+            self._mc_low[merged_count - 2] if merged_count >= 2 else 0.0,
+            self._mc_high[merged_count - 1] if merged_count >= 1 else 0.0,
+            self._mc_low[merged_count - 1] if merged_count >= 1 else 0.0
+        )
+
+        # 新合并K线的数量已知，列缓冲区一次扩到位，循环中不再逐次加倍。
+        required_capacity: int = merged_count + int(np.count_nonzero(is_new_array[:resolved_count]))
+        if required_capacity > self._mc_high.shape[0]:
+            for name in ('_mc_high', '_mc_low', '_mc_period', '_mc_left_ordinary_id'):
+                self._grow(name, required_capacity)
+
+        high_list: List[float] = high_array.tolist()
+        low_list: List[float] = low_array.tolist()
+        is_new_list: List[int] = is_new_array[:resolved_count].tolist()
+        merged_high_list: List[float] = merged_high_array[:resolved_count].tolist()
+        merged_low_list: List[float] = merged_low_array[:resolved_count].tolist()
+
+        # 日志级别在循环外判断一次，关闭日志时不再逐轮调用日志函数。
+        is_logging: bool = log_level >= LogLevel.Simple
 
         # Loop.
         for idx in range(count):
 
             # Log: New turn.
-            log_event_new_turn(log_level, idx, count)
-
-            self.run_step_by_step(
-                high=df.iloc[idx].at['high'].copy(),
-                low=df.iloc[idx].at['low'].copy()
-            )
+            if is_logging:
+                log_event_new_turn(log_level, idx, count)
+
+            if idx < resolved_count:
+                if self._apply_merged_candle(
+                        is_new=is_new_list[idx],
+                        high=merged_high_list[idx],
+                        low=merged_low_list[idx]
+                ) == Action.MergedCandleGenerated:
+                    self._run_after_merged_candle_generated()
+            else:
+                self.run_step_by_step(
+                    high=high_list[idx],
+                    low=low_list[idx]
+                )
 
-            self.log_turn_report()
+            if is_logging:
+                self.log_turn_report(log_level)
 
     def log_turn_report(self,
                         log_level: Optional[LogLevel] = None
@@ -1490,12 +2034,12 @@ class ChanTheoryDynamic(ChanTheory):
             log_level = self._log_level
 
         # Log turn finished.
-        if log_level.value < LogLevel.Simple.value:
+        if log_level < LogLevel.Simple:
             return
         else:
             print(f'\n  ■ 处理完毕。')
 
-        if log_level.value < LogLevel.Normal.value:
+        if log_level < LogLevel.Normal:
             return
 
         # Declare variable.
@@ -1506,9 +2050,9 @@ class ChanTheoryDynamic(ChanTheory):
         # Log: Merged candles.
         count = 4
         width = len(str(count - 1)) + 1
-        print(f'\n    合并K线数量： {self.merged_candles_count}。')
+        print(f'\n    合并K线数量： {self._merged_candles_count}。')
         for i in range(1, count):
-            if self.merged_candles_count >= i:
+            if self._merged_candles_count >= i:
                 candle = self._merged_candles[-i]
                 print(
                     f'      向左第{i:>{width}}根合并K线：'
@@ -1521,9 +2065,9 @@ class ChanTheoryDynamic(ChanTheory):
         # Log: Fractals.
         count = 3
         width = len(str(count - 1)) + 1
-        print(f'\n    分型数量： {self.fractals_count}。')
+        print(f'\n    分型数量： {self._fractals_count}。')
         for i in range(1, count):
-            if self.fractals_count >= i:
+            if self._fractals_count >= i:
                 fractal = self._fractals[-i]
                 print(
                     f'      向左第{i:>{width}}个分型：id = {fractal.id}，'
@@ -1536,9 +2080,9 @@ class ChanTheoryDynamic(ChanTheory):
         # Log: Strokes.
         count = 4
         width = len(str(count - 1)) + 1
-        print(f'\n    笔数量： {self.strokes_count}。')
+        print(f'\n    笔数量： {self._strokes_count}。')
         for i in range(1, count):
-            if self.strokes_count >= i:
+            if self._strokes_count >= i:
                 stroke = self._strokes[-i]
                 print(
                     f'      向左第{i:>{width}}个笔：id = {stroke.id}，trend = {stroke.trend.value}，'
@@ -1552,9 +2096,9 @@ class ChanTheoryDynamic(ChanTheory):
         # Log: Segments.
         count = 4
         width = len(str(count - 1)) + 1
-        print(f'\n    线段数量： {self.segments_count}。')
+        print(f'\n    线段数量： {self._segments_count}。')
         for i in range(1, count):
-            if self.segments_count >= i:
+            if self._segments_count >= i:
                 segment = self._segments[-i]
                 print(
                     f'      向左第{i:>{width}}个线段：id = {segment.id}，'
@@ -1562,7 +2106,7 @@ class ChanTheoryDynamic(ChanTheory):
                     f'idx（普通K线）= '
                     f'{segment.left_ordinary_id} ~ {segment.right_ordinary_id}，'
                     f'price = {segment.left_price} ~ {segment.right_price}，'
-                    f'笔 id = {[stroke_id for stroke_id in segment.stroke_id_list]}。'
+                    f'笔 id = {segment.stroke_id_list}。'
                 )
             else:
                 print(f'      向左第{i:>{width}}个线段：不存在。')
@@ -1570,9 +2114,9 @@ class ChanTheoryDynamic(ChanTheory):
         # Log: Stroke pivots.
         count = 3
         width = len(str(count - 1)) + 1
-        print(f'\n    笔中枢数量： {self.stroke_pivots_count}。')
+        print(f'\n    笔中枢数量： {self._stroke_pivots_count}。')
         for i in range(1, count):
-            if self.stroke_pivots_count >= i:
+            if self._stroke_pivots_count >= i:
                 pivot = self._stroke_pivots[-i]
                 print(
                     f'      向左第{i:>{width}}个笔中枢：id = {pivot.id}，'
@@ -1611,97 +2155,34 @@ class ChanTheoryDynamic(ChanTheory):
              fractal_marker_offset: int = 50
              ):
         # 白底配色
-        color = mpf.make_marketcolors(
-            up='red',  # 上涨K线的颜色
-            down='green',  # 下跌K线的颜色
-            inherit=True
-        )
-        # 黑色配色
-        # style = {
-        #     'style_name': 'background_black',
-        #     'base_mpf_style':'nightclouds',
-        #     'base_mpl_style': 'dark_background',
-        #     'marketcolors': {
-        #         'candle': {
-        #             'up': 'w',
-        #             'down': '#0095ff'
-        #         },
-        #         'edge': {
-        #             'up': 'w',
-        #             'down': '#0095ff'
-        #         },
-        #         'wick': {
-        #             'up': 'w',
-        #             'down': 'w'
-        #         },
-        #         'ohlc': {
-        #             'up': 'w',
-        #             'down': 'w'
-        #         },
-        #         'volume': {
-        #             'up': 'w',
-        #             'down': '#0095ff'
-        #         },
-        #         'vcdopcod': False,
-        #         'alpha': 1.0,
-        #     },
-        #     'mavcolors': [
-        #         '#40e0d0',
-        #         '#ff00ff',
-        #         '#ffd700',
-        #         '#1f77b4',
-        #         '#ff7f0e',
-        #         '#2ca02c',
-        #         '#e377c2'
-        #     ],
-        #     'y_on_right': False,
-        #     'facecolor': '#0b0b0b',
-        #     'gridcolor': '#999999',
-        #     'gridstyle': '--',
-        #     'rc': [
-        #         ('patch.linewidth', 1.0),
-        #         ('lines.linewidth', 1.0),
-        #         ('figure.titlesize', 'x-large'),
-        #         ('figure.titleweight', 'semibold'),
-        #     ],
-        # }
-
-        style = mpf.make_mpf_style(
-            marketcolors=color,
-            rc={
-                'font.family': 'SimHei',  # 指定默认字体：解决plot不能显示中文问题
-                'axes.unicode_minus': False,  # 解决保存图像是负号'-'显示为方块的问题
-            }
-        )
+        style = get_plot_style()
 
         # 附加元素
         additional_plot: list = []
 
         # 分型
         if show_fractal:
-            fractal_t: list = []
-            fractal_b: list = []
-            previous_fractal_ordinary_id: int = 0
-
-            for i in range(self.fractals_count):
-                fractal = self._fractals[i]
-
-                # idx from previous fractal.ordinary_id to current fractal.ordinary_id
-                for j in range(previous_fractal_ordinary_id, fractal.ordinary_id):
-                    fractal_t.append(np.nan)
-                    fractal_b.append(np.nan)
-
-                if fractal.pattern == FractalPattern.Top:
-                    fractal_t.append(fractal.middle_candle.high + fractal_marker_offset)
-                    fractal_b.append(np.nan)
-                else:
-                    fractal_t.append(np.nan)
-                    fractal_b.append(fractal.middle_candle.low - fractal_marker_offset)
-                previous_fractal_ordinary_id = fractal.ordinary_id + 1
+            # 没有分型的位置为 nan，只在分型所在的普通K线处赋值。
+            fractal_t: np.ndarray = np.full(count, np.nan)
+            fractal_b: np.ndarray = np.full(count, np.nan)
+
+            # 分型中间K线的 id，其普通K线 id 和价格从合并K线的列中取出，一次写入。
+            fractals_count: int = self._fractals_count
+            middle_id: np.ndarray = self._fractal_middle_id[:fractals_count]
+            fractal_ordinary_id: np.ndarray = (
+                self._mc_left_ordinary_id[middle_id] + self._mc_period[middle_id] - 1
+            )
+            is_visible: np.ndarray = fractal_ordinary_id < count
+            is_top: np.ndarray = self._fractal_pattern[:fractals_count] == _PATTERN_TOP
+            is_visible_top: np.ndarray = is_visible & is_top
+            is_visible_bottom: np.ndarray = is_visible & ~is_top
 
-            for i in range(previous_fractal_ordinary_id, count):
-                fractal_t.append(np.nan)
-                fractal_b.append(np.nan)
+            fractal_t[fractal_ordinary_id[is_visible_top]] = (
+                self._mc_high[middle_id[is_visible_top]] + fractal_marker_offset
+            )
+            fractal_b[fractal_ordinary_id[is_visible_bottom]] = (
+                self._mc_low[middle_id[is_visible_bottom]] - fractal_marker_offset
+            )
 
             additional_plot.append(
                 mpf.make_addplot(
@@ -1721,39 +2202,32 @@ class ChanTheoryDynamic(ChanTheory):
             )
 
         # 笔
+        # 端点的时间一次性从 df.index 中取出，不逐个索引；端点价格从笔的列中取出。
         plot_stroke: List[Tuple[str, float]] = []
-        if self.strokes_count > 0:
-
-            for stroke in self._strokes:
-                plot_stroke.append(
-                    (
-                        df.index[stroke.left_ordinary_id],
-                        stroke.left_price
-                    )
-                )
-                # print(stroke.id, stroke.left_candle)
-            plot_stroke.append(
-                (
-                    df.index[self._strokes[-1].right_ordinary_id],
-                    self._strokes[-1].right_price
+        strokes_count: int = self._strokes_count
+        if strokes_count > 0:
+            plot_stroke = list(
+                zip(
+                    df.index[
+                        [stroke.left_ordinary_id for stroke in self._strokes] +
+                        [self._strokes[-1].right_ordinary_id]
+                    ],
+                    self._stroke_left[:strokes_count].tolist() +
+                    [float(self._stroke_right[strokes_count - 1])]
                 )
             )
-            # print(self._strokes[-1].id, self._strokes[-1].right_candle)
 
         # 线段
         plot_segment: List[Tuple[str, float]] = []
-        if self.segments_count > 0:
-            for segment in self._segments:
-                plot_segment.append(
-                    (
-                        df.index[segment.left_ordinary_id],
-                        segment.left_price
-                    )
-                )
-            plot_segment.append(
-                (
-                    df.index[self._segments[-1].right_ordinary_id],
-                    self._segments[-1].right_price
+        if self._segments_count > 0:
+            plot_segment = list(
+                zip(
+                    df.index[
+                        [segment.left_ordinary_id for segment in self._segments] +
+                        [self._segments[-1].right_ordinary_id]
+                    ],
+                    [segment.left_price for segment in self._segments] +
+                    [self._segments[-1].right_price]
                 )
             )
 
@@ -1796,116 +2270,139 @@ class ChanTheoryDynamic(ChanTheory):
             warn_too_much_data=1000
         )
 
-        if self._log_level.value >= LogLevel.Normal.value:
+        if self._log_level >= LogLevel.Normal:
             for k, v in mpf_config.items():
                 print(k, ': ', v)
 
         candle_width = mpf_config['candle_width']
         line_width = mpf_config['line_width']
 
-        # 额外的元素。
-        patches = []
+        # 额外的元素：合并K线和笔中枢的矩形，以 (N, 4, 2) 顶点数组一次性交给 PolyCollection。
 
         # 生成合并K线元素。
-        for idx in range(self.merged_candles_count):
-            candle = self._merged_candles[idx]
-
-            if candle.left_ordinary_id > count:
-                break
-
-            if not show_all_merged and candle.period == 1:
-                continue
-            patches.append(
-                Rectangle(
-                    xy=(
-                        candle.left_ordinary_id - candle_width / 2,
-                        candle.low
-                    ),
-                    width=candle.period - 1 + candle_width,
-                    height=candle.high - candle.low,
-                    angle=0,
-                    linewidth=line_width * merged_candle_edge_width,
-                    edgecolor='black',
-                    facecolor='gray' if hatch_merged else 'none',
-
-                )
+        # 合并K线按 left_ordinary_id 升序排列，二分查找 count 之内的合并K线。
+        visible_count: int = int(
+            np.searchsorted(
+                self._mc_left_ordinary_id[:self._merged_candles_count],
+                count,
+                side='right'
             )
+        )
+        if show_all_merged:
+            visible_ids = np.arange(visible_count)
+        else:
+            visible_ids = np.flatnonzero(self._mc_period[:visible_count] > 1)
+
+        merged_x0 = self._mc_left_ordinary_id[visible_ids] - candle_width / 2
+        merged_x1 = merged_x0 + (self._mc_period[visible_ids] - 1 + candle_width)
 
         # 生成笔中枢元素。
+        visible_pivots: List[Pivot] = []
         for pivot in self._stroke_pivots:
             if pivot.left_ordinary_id > count:
                 break
-            patches.append(
-                Rectangle(
-                    xy=(
-                        pivot.left_ordinary_id - candle_width / 2,
-                        pivot.low
-                    ),
-                    width=pivot.right_ordinary_id - pivot.left_ordinary_id,
-                    height=pivot.high - pivot.low,
-                    angle=0,
-                    linewidth=line_width * merged_candle_edge_width * 2,
-                    edgecolor='red',
-                    facecolor='none',
-                    fill=False,
-                )
-            )
+            visible_pivots.append(pivot)
 
-        # 生成 patch。
-        patch_collection: PatchCollection = PatchCollection(
-            patches,
-            alpha=0.35
+        pivot_x0 = np.array(
+            [pivot.left_ordinary_id for pivot in visible_pivots], dtype=np.float64
+        ) - candle_width / 2
+        pivot_x1 = pivot_x0 + np.array(
+            [pivot.right_ordinary_id - pivot.left_ordinary_id for pivot in visible_pivots], dtype=np.float64
         )
 
-        # 添加 patch 到 axis。
+        x0 = np.concatenate((merged_x0, pivot_x0))
+        x1 = np.concatenate((merged_x1, pivot_x1))
+        y0 = np.concatenate((
+            self._mc_low[visible_ids],
+            np.array([pivot.low for pivot in visible_pivots], dtype=np.float64)
+        ))
+        y1 = np.concatenate((
+            self._mc_high[visible_ids],
+            np.array([pivot.high for pivot in visible_pivots], dtype=np.float64)
+        ))
+
+        verts = np.empty((len(x0), 4, 2), dtype=np.float64)
+        verts[:, 0, 0] = x0
+        verts[:, 0, 1] = y0
+        verts[:, 1, 0] = x0
+        verts[:, 1, 1] = y1
+        verts[:, 2, 0] = x1
+        verts[:, 2, 1] = y1
+        verts[:, 3, 0] = x1
+        verts[:, 3, 1] = y0
+
+        merged_count: int = len(visible_ids)
+        pivot_count: int = len(visible_pivots)
+
         ax1 = ax_list[0]
-        ax1.add_collection(patch_collection)
+
+        # 生成 collection 并添加到 axis。没有可绘制的矩形时跳过。
+        if merged_count + pivot_count > 0:
+            poly_collection: PolyCollection = PolyCollection(
+                verts,
+                closed=True,
+                edgecolors=['black'] * merged_count + ['red'] * pivot_count,
+                facecolors=['gray' if hatch_merged else 'none'] * merged_count + ['none'] * pivot_count,
+                linewidths=(
+                    [line_width * merged_candle_edge_width] * merged_count
+                    + [line_width * merged_candle_edge_width * 2] * pivot_count
+                ),
+                alpha=0.35
+            )
+            ax1.add_collection(poly_collection)
+
+        # 标注文字共用同一个字体属性，直接构造 Text 添加到 axis，省去 ax.text 的逐次参数处理。
+        label_font: FontProperties = FontProperties(size=7)
 
         # 普通K线 idx
         if show_ordinary_id:
-            idx_ordinary_x: List[int] = []
-            idx_ordinary_y: List[float] = []
-            idx_ordinary_value: List[str] = []
-
-            for idx in range(0, count, 5):
-                idx_ordinary_x.append(idx - candle_width / 2)
-                idx_ordinary_y.append(df.iloc[idx].at['low'] - 14)
-                idx_ordinary_value.append(str(idx))
+            # 每隔 5 根普通K线标注一次，位置和文字一次算出。
+            ordinary_id: np.ndarray = np.arange(0, count, 5)
+            idx_ordinary_x: List[float] = (ordinary_id - candle_width / 2).tolist()
+            idx_ordinary_y: List[float] = (df['low'].to_numpy(dtype=np.float64)[:count:5] - 14).tolist()
+            idx_ordinary_value: List[str] = ordinary_id.astype(str).tolist()
 
             for idx in range(len(idx_ordinary_x)):
-                ax1.text(
-                    x=idx_ordinary_x[idx],
-                    y=idx_ordinary_y[idx],
-                    s=idx_ordinary_value[idx],
-                    color='red',
-                    fontsize=7,
-                    horizontalalignment='left',
-                    verticalalignment='top'
+                ax1.add_artist(
+                    Text(
+                        x=idx_ordinary_x[idx],
+                        y=idx_ordinary_y[idx],
+                        text=idx_ordinary_value[idx],
+                        color='red',
+                        fontproperties=label_font,
+                        horizontalalignment='left',
+                        verticalalignment='top',
+                        clip_on=False
+                    )
                 )
 
         # 缠论K线 idx
         if show_merged_id:
-            idx_chan_x: List[int] = []
-            idx_chan_y: List[float] = []
-            idx_chan_value: List[str] = []
-
-            for i in range(self.merged_candles_count):
-                candle = self._merged_candles[i]
-                idx_chan_x.append(candle.right_ordinary_id - candle_width / 2)
-                idx_chan_y.append(candle.high + 14)
-                idx_chan_value.append(str(self._merged_candles.index(candle)))
-
-            for i in range(len(idx_chan_x)):
-                ax1.text(
-                    x=idx_chan_x[i],
-                    y=idx_chan_y[i],
-                    s=idx_chan_value[i],
-                    color='blue',
-                    fontsize=7,
-                    horizontalalignment='left',
-                    verticalalignment='bottom'
+            # 左侧普通K线 id <= count 的合并K线，位置和价格从列中一次算出。
+            labeled_count: int = int(np.searchsorted(
+                self._mc_left_ordinary_id[:self._merged_candles_count], count, side='right'
+            ))
+            idx_chan_x: List[float] = (
+                self._mc_left_ordinary_id[:labeled_count] + self._mc_period[:labeled_count] - 1 - candle_width / 2
+            ).tolist()
+            idx_chan_y: List[float] = (self._mc_high[:labeled_count] + 14).tolist()
+            idx_chan_value: List[str] = np.arange(labeled_count).astype(str).tolist()
+
+            for i in range(labeled_count):
+                ax1.add_artist(
+                    Text(
+                        x=idx_chan_x[i],
+                        y=idx_chan_y[i],
+                        text=idx_chan_value[i],
+                        color='blue',
+                        fontproperties=label_font,
+                        horizontalalignment='left',
+                        verticalalignment='bottom',
+                        clip_on=False
+                    )
                 )
 
         ax1.autoscale_view()
 
-        print('Plot done.')
+        if self._log_level >= LogLevel.Simple:
+            print('Plot done.')
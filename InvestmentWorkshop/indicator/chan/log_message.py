@@ -32,7 +32,7 @@ def log_event_new_turn(log_level: LogLevel,
     :param count: int. The total number of the turns. Start from 0.
     :return: 
     """
-    if log_level.value < LogLevel.Simple.value:
+    if log_level < LogLevel.Simple:
         return
 
     width: int = len(str(count - 1)) + 1
@@ -49,7 +49,7 @@ def log_event_candle_generated(log_level: LogLevel,
     :param new_element:
     :return: 
     """
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 生成合并K线：\n    第 {new_element.id + 1} 根合并K线，'
             f'起始id（普通K线）= {new_element.left_ordinary_id}，'
@@ -61,7 +61,7 @@ def log_event_candle_generated(log_level: LogLevel,
 def log_event_candle_updated(log_level: LogLevel,
                              merged_candle: MergedCandle
                              ) -> None:
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 修正合并K线：\n    第 {merged_candle.id + 1} 根合并K线，'
             f'起始id（普通K线）= {merged_candle.left_ordinary_id}，'
@@ -73,7 +73,7 @@ def log_event_candle_updated(log_level: LogLevel,
 def log_event_fractal_generated(log_level: LogLevel,
                                 new_element: Fractal
                                 ) -> None:
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 生成分型：\n    第 {new_element.id + 1} 个分型，模式 = {new_element.pattern.value}，'
             f'位置id（合并K线）= {new_element.merged_id}，位置id（普通K线）= {new_element.ordinary_id}。'
@@ -84,7 +84,7 @@ def log_event_fractal_updated(log_level: LogLevel,
                               old_fractal: Fractal,
                               new_candle: MergedCandle,
                               ) -> None:
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 修正分型：\n    第 {old_fractal.id + 1} 个分型，模式= {old_fractal.pattern.value}，'
             f'位置由（合并K线id）= {old_fractal.merged_id}、（普通K线）= {old_fractal.ordinary_id}，'
@@ -98,7 +98,7 @@ def log_event_fractal_dropped(log_level: LogLevel,
                               mc_id: int,
                               oc_id: int
                               ) -> None:
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 丢弃分型：'
             f'\n    第 {element_id} 个分型，模式 = {pattern.value}，'
@@ -109,7 +109,7 @@ def log_event_fractal_dropped(log_level: LogLevel,
 def log_event_stroke_generated(log_level: LogLevel,
                                new_element: Stroke
                                ) -> None:
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 生成笔：\n    第 {new_element.id + 1} 个笔，趋势 = {new_element.trend}，'
             f'起点（合并K线 id）= {new_element.left_merged_id}、'
@@ -123,7 +123,7 @@ def log_event_stroke_updated(log_level: LogLevel,
                              old_stroke: Stroke,
                              new_candle: MergedCandle
                              ) -> None:
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 修正笔：\n    第 {old_stroke.id + 1} 个笔，趋势 = {old_stroke.trend}，'
             f'终点由（合并K线id）= {old_stroke.right_merged_id}、'
@@ -135,7 +135,7 @@ def log_event_stroke_updated(log_level: LogLevel,
 def log_event_segment_generated(log_level: LogLevel,
                                 new_element: Segment
                                 ):
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 生成线段：\n    第 {new_element.id + 1} 个线段，趋势 = {new_element.trend}，'
             f'起点id：合并K线 = {new_element.left_merged_id}，'
@@ -150,12 +150,12 @@ def log_event_segment_extended(log_level: LogLevel,
                                element: Segment,
                                stroke: Stroke
                                ):
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 延伸线段：\n    第 {element.id + 1} 个线段，趋势 = {element.trend}，'
             f'原终点id 合并K线= {element.right_merged_id}，'
             f'普通K线= {element.right_ordinary_id}，'
-            f'现终点id 合并K线= {stroke.right_ordinary_id}，'
+            f'现终点id 合并K线= {stroke.right_merged_id}，'
             f'普通K线= {stroke.right_ordinary_id}。'
         )
 
@@ -165,7 +165,7 @@ def log_event_segment_expanded(log_level: LogLevel,
                                stroke: Stroke,
                                new_strokes: List[int]
                                ):
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 扩展线段：\n    第 {element.id + 1} 个线段，趋势 = {element.trend}，'
             f'原终点id 合并K线 = {element.right_merged_id}，'
@@ -179,7 +179,7 @@ def log_event_segment_expanded(log_level: LogLevel,
 def log_event_isolation_line_generated(log_level: LogLevel,
                                        new_element: IsolationLine
                                        ) -> None:
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 生成同级别分解线：\n    第 {new_element.id + 1} 个同级别分解线，'
             f'位置（合并K线） = {new_element.merged_id}，位置（普通K线） = {new_element.ordinary_id}。'
@@ -189,7 +189,7 @@ def log_event_isolation_line_generated(log_level: LogLevel,
 def log_event_stroke_pivot_generated(log_level: LogLevel,
                                      new_element: Pivot
                                      ):
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 生成笔中枢：\n    第 {new_element.id + 1} 个笔中枢，'
             f'起点id 合并K线 = {new_element.left_merged_id}，'
@@ -205,7 +205,7 @@ def log_event_stroke_pivot_extended(log_level: LogLevel,
                                     old_oc_id: int,
                                     new_oc_id: int
                                     ):
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print(
             f'\n  ● 延伸笔中枢：\n    第 {element_id} 个笔中枢，'
             f'原终点id（普通K线） = {old_oc_id}，现终点id（普通K线） = {new_oc_id}。'
@@ -213,12 +213,12 @@ def log_event_stroke_pivot_extended(log_level: LogLevel,
 
 
 def log_try_to_generate_merged_candle(log_level: LogLevel) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('\n  ○ 尝试生成合并K线：')
 
 
 def log_try_to_generate_fractal(log_level: LogLevel) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(f'\n  ○ 尝试生成分型：')
 
 
@@ -226,7 +226,7 @@ def log_try_to_update_fractal(log_level: LogLevel,
                               last_fractal: Fractal,
                               last_candle: MergedCandle
                               ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(
             f'\n  ○ 尝试修正分型：'
             f'\n    最新分型 id = {last_fractal.id}，模式 = {last_fractal.pattern.value}，'
@@ -237,14 +237,14 @@ def log_try_to_update_fractal(log_level: LogLevel,
 
 
 def log_try_to_generate_first_stroke(log_level: LogLevel) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('\n  ○ 尝试生成笔：')
 
 
 def log_try_to_generate_following_stroke(log_level: LogLevel,
                                          stroke: Stroke,
                                          candle: MergedCandle) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(
             f'\n  ○ 尝试生成后续笔：'
             f'\n    最新笔 id = {stroke.id}，趋势 = {stroke.trend}，'
@@ -255,32 +255,32 @@ def log_try_to_generate_following_stroke(log_level: LogLevel,
 
 
 def log_try_to_update_stroke(log_level: LogLevel) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('\n  ○ 尝试修正笔：')
 
 
 def log_try_to_generate_first_segment(log_level: LogLevel) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('\n  ○ 尝试生成首根线段：')
 
 
 def log_try_to_generate_following_segment(log_level: LogLevel) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('\n  ○ 尝试生成后续线段：')
 
 
 def log_try_to_generate_isolation_line(log_level: LogLevel) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('\n  ○ 尝试生成同级别分解线：')
 
 
 def log_try_to_generate_stroke_pivot(log_level: LogLevel) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('\n  ○ 尝试生成笔中枢：')
 
 
 def log_try_to_generate_segment_pivot(log_level: LogLevel) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('\n  ○ 尝试生成段中枢：')
 
 
@@ -288,7 +288,7 @@ def log_show_2_candles(log_level: LogLevel,
                        left_candle: MergedCandle,
                        right_candle: MergedCandle
                        ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(
             f'    左侧合并K线 id（合并K线）= {left_candle.id}，'
             f'id（普通K线）= {left_candle.ordinary_id}，'
@@ -306,7 +306,7 @@ def log_show_3_candles(log_level: LogLevel,
                        middle_candle: MergedCandle,
                        right_candle: MergedCandle
                        ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(
             f'\n    左侧合并K线 id（合并K线）= {left_candle.id}，'
             f'id（普通K线）= {left_candle.ordinary_id}，'
@@ -328,7 +328,7 @@ def log_show_mobile_side_candles_in_generating_stroke(log_level: LogLevel,
     if left_candle is None and right_candle is None:
         raise ValueError('only one of <left_candle> and <right_candle> can not be None.')
 
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(f'    移动端：')
         if left_candle is None:
             print(
@@ -367,7 +367,7 @@ def log_show_fixed_side_candles_in_generating_stroke(log_level: LogLevel,
                                                      middle_candle: MergedCandle,
                                                      fractal_pattern: Optional[FractalPattern]
                                                      ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(
             f'    固定端（右侧）：\n'
             f'        最新合并K线 id（合并K线）= {left_candle.id}，'
@@ -387,7 +387,7 @@ def log_show_fixed_side_pattern_in_generating_stroke(log_level: LogLevel,
                                                      middle_candle: MergedCandle,
                                                      fractal_pattern: FractalPattern
                                                      ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(
             f'    固定端（左侧）：\n'
             f'        关键合并K线 id（合并K线）= {middle_candle.id}，'
@@ -401,7 +401,7 @@ def log_not_enough_merged_candles(log_level: LogLevel,
                                   count: int,
                                   required: int
                                   ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(f'    合并K线数量不足，仅有 {count} 个，至少需要 {required} 个。')
 
 
@@ -409,7 +409,7 @@ def log_test_result_distance(log_level: LogLevel,
                              distance: int,
                              distance_required: int
                              ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('      测试：是否满足最小距离要求。')
         if distance >= distance_required:
             print(
@@ -426,7 +426,7 @@ def log_test_result_distance(log_level: LogLevel,
 def log_test_result_fractal(log_level: LogLevel,
                             fractal_pattern: Optional[FractalPattern]
                             ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('      测试：是否能够构成分型。')
         if fractal_pattern is None:
             print(
@@ -444,7 +444,7 @@ def log_test_result_fractal_pattern(log_level: LogLevel,
                                     left_fractal_pattern: FractalPattern,
                                     right_fractal_pattern: FractalPattern,
                                     ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('      测试：是否两个分型的类型不同。')
         if left_fractal_pattern == right_fractal_pattern:
             print(
@@ -469,7 +469,7 @@ def log_test_result_price_range(log_level: LogLevel,
                                 break_low: bool,
                                 candle: MergedCandle
                                 ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('      测试：是否两个分型之间的价格没有达到或突破分型的极值价。')
         if break_high is False and break_low is False:
             print(
@@ -494,7 +494,7 @@ def log_test_result_price_break(log_level: LogLevel,
                                 stroke: Stroke,
                                 candle: MergedCandle
                                 ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('    测试合并K线的价格是否达到或突破笔的右侧价：')
         if stroke.trend == Trend.Bullish:
             if candle.high >= stroke.right_price:
@@ -524,7 +524,7 @@ def log_result_price_break_test_for_update_fractal(log_level: LogLevel,
                                                    fractal: Fractal,
                                                    candle: MergedCandle
                                                    ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print('    测试合并K线的价格是否达到或突破分型的极值价：')
         if fractal.pattern == FractalPattern.Top:
             if candle.high >= fractal.extreme_price:
@@ -553,7 +553,7 @@ def log_result_price_break_test_for_update_fractal(log_level: LogLevel,
 def log_failed_in_be_the_extreme_price(log_level: LogLevel,
                                        r: RelationshipInNumbers
                                        ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(
             ' ' * 8,
             f'左侧合并K线的最高价 < {str(r)} 中间合并K线的最高价 {str(r)} 右侧合并K线的最高价，不满足。'
@@ -563,21 +563,21 @@ def log_failed_in_be_the_extreme_price(log_level: LogLevel,
 def log_passed_in_pattern_type(log_level: LogLevel,
                                pattern: FractalPattern
                                ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(' ' * 8, f'新分型的模式 = {pattern}，与前分型不同，满足。')
 
 
 def log_failed_in_pattern_type(log_level: LogLevel,
                                pattern: FractalPattern
                                ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(' ' * 8, f'新分型的模式 = {pattern}，与前分型相同，不满足。')
 
 
 def log_failed_in_price(log_level: LogLevel,
                         r: RelationshipInNumbers
                         ) -> None:
-    if log_level.value >= LogLevel.Detailed.value:
+    if log_level >= LogLevel.Detailed:
         print(
             ' ' * 8, f'最新合并K线的最高价 {r} 最新笔的右侧价，不满足。'
         )
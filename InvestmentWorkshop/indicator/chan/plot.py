@@ -4,11 +4,15 @@ __author__ = 'Bruce Frank Wong'
 
 
 from typing import List, Tuple
+from functools import lru_cache
+from bisect import bisect_right
+from operator import attrgetter
 
 import numpy as np
 import pandas as pd
-from matplotlib.patches import Rectangle
-from matplotlib.collections import PatchCollection
+from matplotlib.collections import PolyCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.text import Text
 import mplfinance as mpf
 
 from .definition import (
@@ -21,7 +25,13 @@ from .definition import (
 )
 
 
+@lru_cache(maxsize=1)
 def get_plot_style():
+    """
+    白底配色的 mplfinance 样式。只构造一次，之后的调用返回同一个样式。
+
+    :return: mplfinance style.
+    """
     mpf_color = mpf.make_marketcolors(
         up='red',  # 上涨K线的颜色
         down='green',  # 下跌K线的颜色
@@ -76,34 +86,39 @@ def plot_chan_theory(df: pd.DataFrame,
 
     # 最大日期
     max_date = df.index[count]
-    print(max_date)
+    if debug:
+        print(max_date)
 
     # 附加元素
     additional_plot: list = []
 
     # 分型 和 笔
+    # 没有分型的位置为 nan，只在分型所在的普通K线处赋值。
     fractal: Fractal
-    fractal_t: list = []
-    fractal_b: list = []
-    idx_fractal_to_ordinary: int
-    idx_ordinary_candle: int = 0
-
-    for i in range(chan.fractals_count):
-        fractal = chan.fractals[i]
-
-        for j in range(idx_ordinary_candle, fractal.ordinary_id):
-            fractal_t.append(np.nan)
-            fractal_b.append(np.nan)
-        if fractal.pattern == FractalPattern.Top:
-            fractal_t.append(fractal.middle_candle.high + fractal_marker_offset)
-            fractal_b.append(np.nan)
-        if fractal.pattern == FractalPattern.Bottom:
-            fractal_t.append(np.nan)
-            fractal_b.append(fractal.middle_candle.low - fractal_marker_offset)
-        idx_ordinary_candle = fractal.ordinary_id + 1
-    for i in range(idx_ordinary_candle, count):
-        fractal_t.append(np.nan)
-        fractal_b.append(np.nan)
+    fractal_t: np.ndarray = np.full(count, np.nan)
+    fractal_b: np.ndarray = np.full(count, np.nan)
+
+    # 一次取出分型的普通K线 id、类型和中间K线的价格，按掩码写入。
+    fractal_list: List[Fractal] = chan.fractals
+    fractal_ordinary_id: np.ndarray = np.fromiter(
+        (fractal.ordinary_id for fractal in fractal_list), dtype=np.int64, count=len(fractal_list)
+    )
+    fractal_high: np.ndarray = np.fromiter(
+        (fractal.middle_candle.high for fractal in fractal_list), dtype=np.float64, count=len(fractal_list)
+    )
+    fractal_low: np.ndarray = np.fromiter(
+        (fractal.middle_candle.low for fractal in fractal_list), dtype=np.float64, count=len(fractal_list)
+    )
+    is_visible: np.ndarray = fractal_ordinary_id < count
+    is_top: np.ndarray = is_visible & np.fromiter(
+        (fractal.pattern == FractalPattern.Top for fractal in fractal_list), dtype=bool, count=len(fractal_list)
+    )
+    is_bottom: np.ndarray = is_visible & np.fromiter(
+        (fractal.pattern == FractalPattern.Bottom for fractal in fractal_list), dtype=bool, count=len(fractal_list)
+    )
+
+    fractal_t[fractal_ordinary_id[is_top]] = fractal_high[is_top] + fractal_marker_offset
+    fractal_b[fractal_ordinary_id[is_bottom]] = fractal_low[is_bottom] - fractal_marker_offset
 
     additional_plot.append(
         mpf.make_addplot(fractal_t, type='scatter', markersize=fractal_marker_size, marker='v')
@@ -116,17 +131,17 @@ def plot_chan_theory(df: pd.DataFrame,
     plot_stroke: List[Tuple[str, float]] = []
     stroke: Stroke
     if chan.strokes_count > 0:
-
-        for stroke in chan.strokes:
-            if df.index[stroke.left_ordinary_id] > max_date:
-                break
-            plot_stroke.append(
-                (
-                    df.index[stroke.left_ordinary_id],
-                    stroke.left_price
-                )
+        # 端点的时间一次性从 df.index 中取出，截止到第一个超过 max_date 的笔。
+        strokes: List[Stroke] = chan.strokes
+        stroke_time: pd.DatetimeIndex = df.index[[stroke.left_ordinary_id for stroke in strokes]]
+        is_beyond: np.ndarray = np.asarray(stroke_time > max_date)
+        end: int = int(np.argmax(is_beyond)) if is_beyond.any() else len(strokes)
+        plot_stroke = list(
+            zip(
+                stroke_time[:end],
+                [stroke.left_price for stroke in strokes[:end]]
             )
-            # print(stroke.id, stroke.left_candle)
+        )
         # plot_stroke.append(
         #     (
         #         df.index[chan.strokes[-1].right_ordinary_id],
@@ -190,118 +205,129 @@ def plot_chan_theory(df: pd.DataFrame,
         for k, v in mpf_config.items():
             print(k, v)
 
-    # 额外的元素。
-    patches = []
-
-    # 生成合并K线元素。
-    for idx in range(chan.merged_candles_count):
-        candle = chan.merged_candles[idx]
-
-        if candle.left_ordinary_id > count:
-            break
-
-        if not show_all_merged and candle.period == 1:
-            continue
-        patches.append(
-            Rectangle(
-                xy=(
-                    candle.left_ordinary_id - candle_width / 2,
-                    candle.low
-                ),
-                width=candle.period - 1 + candle_width,
-                height=candle.high - candle.low,
-                angle=0,
-                linewidth=line_width * merged_candle_edge_width,
-                edgecolor='black',
-                facecolor='gray' if hatch_merged else 'none',
-            )
-        )
+    # 在绘制范围内的合并K线，矩形和 id 标注共用。合并K线按左侧普通K线 id 递增排列，二分查找截止位置。
+    merged_candle_list: List[MergedCandle] = chan.merged_candles
+    merged_candle_list = merged_candle_list[
+        :bisect_right(merged_candle_list, count, key=attrgetter('left_ordinary_id'))
+    ]
 
-    # 生成 patch。
-    patch_collection: PatchCollection = PatchCollection(
-        patches,
-        alpha=0.35
+    # 生成合并K线元素：矩形以 (N, 4, 2) 顶点数组一次性交给 PolyCollection。
+    visible_candles: List[MergedCandle] = (
+        merged_candle_list if show_all_merged else [candle for candle in merged_candle_list if candle.period != 1]
     )
 
-    # 添加 patch 到 axis。
+    visible_count: int = len(visible_candles)
+    x0: np.ndarray = np.fromiter(
+        (candle.left_ordinary_id for candle in visible_candles), dtype=np.float64, count=visible_count
+    ) - candle_width / 2
+    x1: np.ndarray = x0 + np.fromiter(
+        (candle.period for candle in visible_candles), dtype=np.float64, count=visible_count
+    ) - 1 + candle_width
+    y0: np.ndarray = np.fromiter(
+        (candle.low for candle in visible_candles), dtype=np.float64, count=visible_count
+    )
+    y1: np.ndarray = np.fromiter(
+        (candle.high for candle in visible_candles), dtype=np.float64, count=visible_count
+    )
+
+    verts: np.ndarray = np.empty((visible_count, 4, 2), dtype=np.float64)
+    verts[:, 0, 0] = x0
+    verts[:, 0, 1] = y0
+    verts[:, 1, 0] = x0
+    verts[:, 1, 1] = y1
+    verts[:, 2, 0] = x1
+    verts[:, 2, 1] = y1
+    verts[:, 3, 0] = x1
+    verts[:, 3, 1] = y0
+
     ax1 = ax_list[0]
-    ax1.add_collection(patch_collection)
+
+    # 生成 collection 并添加到 axis。没有可绘制的矩形时跳过。
+    if visible_count > 0:
+        poly_collection: PolyCollection = PolyCollection(
+            verts,
+            closed=True,
+            edgecolors='black',
+            facecolors='gray' if hatch_merged else 'none',
+            linewidths=line_width * merged_candle_edge_width,
+            alpha=0.35
+        )
+        ax1.add_collection(poly_collection)
+
+    # 标注文字共用同一个字体属性，直接构造 Text 添加到 axis，省去 ax.text 的逐次参数处理。
+    label_font: FontProperties = FontProperties(size=7)
 
     # 普通K线 idx
     if show_ordinary_id:
-        idx_ordinary_x: List[int] = []
-        idx_ordinary_y: List[float] = []
-        idx_ordinary_value: List[str] = []
-
-        for idx in range(0, count, 5):
-            idx_ordinary_x.append(idx - candle_width / 2)
-            idx_ordinary_y.append(df.iloc[idx].at['low'] - 14)
-            idx_ordinary_value.append(str(idx))
+        # 每隔 5 根普通K线标注一次，位置和文字一次算出。
+        ordinary_id: np.ndarray = np.arange(0, count, 5)
+        idx_ordinary_x: List[float] = (ordinary_id - candle_width / 2).tolist()
+        idx_ordinary_y: List[float] = (df['low'].to_numpy(dtype=np.float64)[:count:5] - 14).tolist()
+        idx_ordinary_value: List[str] = ordinary_id.astype(str).tolist()
 
         for idx in range(len(idx_ordinary_x)):
-            ax1.text(
-                x=idx_ordinary_x[idx],
-                y=idx_ordinary_y[idx],
-                s=idx_ordinary_value[idx],
-                color='red',
-                fontsize=7,
-                horizontalalignment='left',
-                verticalalignment='top'
+            ax1.add_artist(
+                Text(
+                    x=idx_ordinary_x[idx],
+                    y=idx_ordinary_y[idx],
+                    text=idx_ordinary_value[idx],
+                    color='red',
+                    fontproperties=label_font,
+                    horizontalalignment='left',
+                    verticalalignment='top',
+                    clip_on=False
+                )
             )
 
     # 缠论K线 idx
     if show_merged_id:
-        idx_chan_x: List[int] = []
-        idx_chan_y: List[float] = []
-        idx_chan_value: List[str] = []
-
-        for i in range(chan.merged_candles_count):
-            candle = chan.merged_candles[i]
-            idx_chan_x.append(candle.right_ordinary_id - candle_width / 2)
-            idx_chan_y.append(candle.high + 14)
-            idx_chan_value.append(str(chan.merged_candles.index(candle)))
+        idx_chan_x: List[float] = [candle.right_ordinary_id - candle_width / 2 for candle in merged_candle_list]
+        idx_chan_y: List[float] = [candle.high + 14 for candle in merged_candle_list]
+        idx_chan_value: List[str] = np.arange(len(merged_candle_list)).astype(str).tolist()
 
         for i in range(len(idx_chan_x)):
-            ax1.text(
-                x=idx_chan_x[i],
-                y=idx_chan_y[i],
-                s=idx_chan_value[i],
-                color='blue',
-                fontsize=7,
-                horizontalalignment='left',
-                verticalalignment='bottom'
+            ax1.add_artist(
+                Text(
+                    x=idx_chan_x[i],
+                    y=idx_chan_y[i],
+                    text=idx_chan_value[i],
+                    color='blue',
+                    fontproperties=label_font,
+                    horizontalalignment='left',
+                    verticalalignment='bottom',
+                    clip_on=False
+                )
             )
 
     ax1.autoscale_view()
 
-    print('Plot done.')
+    if debug:
+        print('Plot done.')
 
 
 def plot_pure_merged_candle(merged_candle_list: List[MergedCandle],
                             count: int):
     style = get_plot_style()
 
+    # 价格列一次构造，不逐行写入 DataFrame（df.iloc[idx].at[...] 写的是行的副本）。
+    plot_count: int = min(len(merged_candle_list), count)
+    low_array: np.ndarray = np.fromiter(
+        (candle.low for candle in merged_candle_list[:plot_count]), dtype=np.float64, count=plot_count
+    )
+    high_array: np.ndarray = np.fromiter(
+        (candle.high for candle in merged_candle_list[:plot_count]), dtype=np.float64, count=plot_count
+    )
     df: pd.DataFrame = pd.DataFrame(
         {
-            'open': 0.0,
-            'high': 0.0,
-            'low': 0.0,
-            'close': 0.0,
+            'open': low_array,
+            'high': high_array,
+            'low': low_array,
+            'close': high_array,
         },
         index=pd.Series(
-            range(
-                min(
-                    len(merged_candle_list),
-                    count
-                )
-            )
+            range(plot_count)
         )
     )
-    for idx in range(len(merged_candle_list)):
-        df.iloc[idx].at['open'] = merged_candle_list[idx].low
-        df.iloc[idx].at['low'] = merged_candle_list[idx].low
-        df.iloc[idx].at['high'] = merged_candle_list[idx].high
-        df.iloc[idx].at['close'] = merged_candle_list[idx].high
 
     mpf.plot(
         df,
@@ -5,6 +5,7 @@ __author__ = 'Bruce Frank Wong'
 
 from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from .definition import (
@@ -13,6 +14,10 @@ from .definition import (
 
     FractalPattern,
     Trend,
+    _TOP,
+    _BOTTOM,
+    _BULLISH,
+    _BEARISH,
 
     OrdinaryCandle,
     MergedCandle,
@@ -26,15 +31,12 @@ from .definition import (
 )
 from .utility import (
     is_fractal_pattern,
-    is_overlap,
-    generate_merged_candle,
+    generate_merged_candle_list,
     generate_fractal,
     try_to_generate_first_stroke,
 )
 from .log_message import (
     log_event_new_turn,
-    log_event_candle_generated,
-    log_event_candle_updated,
     log_event_fractal_generated,
     log_event_fractal_updated,
     log_event_fractal_dropped,
@@ -85,52 +87,12 @@ def generate_merged_candles_with_dataframe(df: pd.DataFrame,
     # Handle parameters.
     if count is None or count <= 0 or count > len(df):
         count = len(df)
-    
-    # Declare variables type.
-    merged_candles: List[MergedCandle] = []
-    ordinary_candle: OrdinaryCandle
-    new_candle: MergedCandle
-
-    old_candle_left: Optional[MergedCandle]
-    old_candle_right: Optional[MergedCandle]
-
-    for idx in range(count):
-        log_event_new_turn(log_level, idx, count)
-        
-        ordinary_candle = OrdinaryCandle(
-            high=df.iloc[idx].at['high'].copy(),
-            low=df.iloc[idx].at['low'].copy()
-        )
-
-        if len(merged_candles) >= 2:
-            old_candle_right = merged_candles[-1]
-            old_candle_left = merged_candles[-2]
-        elif len(merged_candles) == 1:
-            old_candle_right = merged_candles[-1]
-            old_candle_left = None
-        else:
-            old_candle_right = None
-            old_candle_left = None
 
-        new_candle = generate_merged_candle(
-            ordinary_candle=ordinary_candle,
-            last_candle=(old_candle_left, old_candle_right)
-        )
-
-        if old_candle_right is None or new_candle.id != old_candle_right.id:
-            log_event_candle_generated(
-                log_level=log_level,
-                new_element=new_candle
-            )
-
-            merged_candles.append(new_candle)
-        else:
-            log_event_candle_updated(
-                log_level=log_level,
-                merged_candle=new_candle
-            )
-
-    return merged_candles
+    return generate_merged_candle_list(
+        df['high'].to_numpy(dtype=np.float64)[:count],
+        df['low'].to_numpy(dtype=np.float64)[:count],
+        log_level
+    )
 
 
 def _generate_fractal(left_candle: MergedCandle,
@@ -175,13 +137,13 @@ def _generate_fractal(left_candle: MergedCandle,
             middle_candle.high > right_candle.high:
         if verbose:
             print('        中间合并K线的最高价 > 左右两侧合并K线的最高价，满足。')
-        pattern = FractalPattern.Top
+        pattern = _TOP
 
     elif middle_candle.low < left_candle.low and \
             middle_candle.low < right_candle.low:
         if verbose:
             print('        中间合并K线的最高价 < 左右两侧合并K线的最高价，满足。')
-        pattern = FractalPattern.Bottom
+        pattern = _BOTTOM
 
     elif left_candle.high < middle_candle.high < right_candle.high:
         if verbose:
@@ -194,8 +156,7 @@ def _generate_fractal(left_candle: MergedCandle,
         return
 
     else:
-        print('【ERROR】')
-        return
+        raise RuntimeError('Unexpected relationship in three merged candles.')
 
     # 判定模式。
     if determine_pattern:
@@ -270,28 +231,28 @@ def generate_fractals(merged_candles: List[MergedCandle],
             is_updated: bool = False
 
             # 如果当前合并K线顺向突破（即最高价大于顶分型中间K线的最高价，对底分型反之）。
-            if last_fractal.pattern == FractalPattern.Top:
+            if last_fractal.pattern == _TOP:
                 if last_candle.high < last_fractal.middle_candle.high:
-                    if log_level.value >= LogLevel.Detailed.value:
+                    if log_level >= LogLevel.Detailed:
                         print(
                             ' ' * 8, f'最新合并K线的最高价 <= 最新笔的右侧价，不满足。'
                         )
                 else:
                     is_updated = True
-                    if log_level.value >= LogLevel.Detailed.value:
+                    if log_level >= LogLevel.Detailed:
                         print(
                             ' ' * 8, f'最新合并K线的最高价 > 最新笔的右侧价，满足。'
                         )
 
             else:   # last_fractal.pattern == FractalPattern.Bottom
                 if last_candle.low > last_fractal.middle_candle.low:
-                    if log_level.value >= LogLevel.Detailed.value:
+                    if log_level >= LogLevel.Detailed:
                         print(
                             ' ' * 8, f'最新合并K线的最高价 >= 最新笔的右侧价，不满足。'
                         )
                 else:
                     is_updated = True
-                    if log_level.value >= LogLevel.Detailed.value:
+                    if log_level >= LogLevel.Detailed:
                         print(
                             ' ' * 8, f'最新合并K线的最高价 < 最新笔的右侧价，满足。'
                         )
@@ -490,7 +451,7 @@ def generate_strokes(merged_candles: List[MergedCandle],
                 # 判定两端分型的中间K线。
                 price_low: float
                 price_high: float
-                if right_fractal_pattern == FractalPattern.Top:
+                if right_fractal_pattern == _TOP:
                     price_low = middle_candle.low
                     price_high = last_middle_candle.high
                 else:
@@ -524,8 +485,7 @@ def generate_strokes(merged_candles: List[MergedCandle],
                 # 创建首个笔。
                 new_stroke = Stroke(
                     id=0,
-                    trend=Trend.Bullish if left_fractal_pattern == FractalPattern.Bottom
-                    else Trend.Bearish,
+                    trend=_BULLISH if left_fractal_pattern == _BOTTOM else _BEARISH,
                     left_candle=middle_candle,
                     right_candle=last_middle_candle
                 )
@@ -552,7 +512,7 @@ def generate_strokes(merged_candles: List[MergedCandle],
             log_try_to_update_stroke(log_level=log_level)
 
             # 如果当前合并K线顺向突破（即最高价大于顶分型中间K线的最高价，对底分型反之）。
-            if last_stroke.trend == Trend.Bullish:
+            if last_stroke.trend == _BULLISH:
                 if last_candle.high >= last_stroke.right_price:
                     is_updated = True
 
@@ -587,10 +547,10 @@ def generate_strokes(merged_candles: List[MergedCandle],
 
         right_side_fractal_pattern: FractalPattern
 
-        if last_stroke.trend == Trend.Bullish:
-            left_side_fractal_pattern = FractalPattern.Top
+        if last_stroke.trend == _BULLISH:
+            left_side_fractal_pattern = _TOP
         else:
-            left_side_fractal_pattern = FractalPattern.Bottom
+            left_side_fractal_pattern = _BOTTOM
 
         # log trying.
         log_try_to_generate_following_stroke(
@@ -644,8 +604,7 @@ def generate_strokes(merged_candles: List[MergedCandle],
 
         new_stroke: Stroke = Stroke(
             id=len(strokes),
-            trend=Trend.Bullish if left_side_fractal_pattern == FractalPattern.Bottom
-            else Trend.Bearish,
+            trend=_BULLISH if left_side_fractal_pattern == _BOTTOM else _BEARISH,
             left_candle=last_stroke.right_candle,
             right_candle=last_candle
         )
@@ -679,11 +638,30 @@ def generate_segments(strokes: List[Stroke],
     # Declare variables.
     segments: List[Segment] = []
 
+    # 首根线段：自前向后（自左向右）第一组同向且有重叠的笔 (idx - 2, idx)。
+    # 一次性计算所有候选位置，取最左侧的一个，代替逐根调用 is_overlap。
+    stroke_high: np.ndarray = np.array(
+        [max(stroke.left_price, stroke.right_price) for stroke in strokes], dtype=np.float64
+    )
+    stroke_low: np.ndarray = np.array(
+        [min(stroke.left_price, stroke.right_price) for stroke in strokes], dtype=np.float64
+    )
+    stroke_bullish: np.ndarray = np.array(
+        [stroke.trend == _BULLISH for stroke in strokes], dtype=np.bool_
+    )
+    is_candidate: np.ndarray = (
+        (stroke_bullish[:-2] == stroke_bullish[2:]) &
+        (np.minimum(stroke_high[:-2], stroke_high[2:]) >= np.maximum(stroke_low[:-2], stroke_low[2:]))
+    )
+    candidates: np.ndarray = np.flatnonzero(is_candidate)
+    if candidates.size == 0:
+        return segments
+
     # Loop.
-    for idx in range(2, len(strokes)):
+    for idx in range(int(candidates[0]) + 2, len(strokes)):
         segments_count: int = 0 if segments is None else len(segments)
 
-        # 如果 线段的数量 == 0，自前向后（自左向右）穷举 stroke，直到创建首根线段。
+        # 如果 线段的数量 == 0，创建首根线段（其位置已由上面的扫描确定）。
         if segments_count == 0:
 
             # 申明变量类型并赋值。
@@ -691,29 +669,21 @@ def generate_segments(strokes: List[Stroke],
             middle_stroke: Stroke = strokes[idx - 1]
             right_strokes: Stroke = strokes[idx]
 
-            overlap_high: float
-            overlap_low: float
-            is_overlapping: bool
-
-            # 重叠区域检测
-            is_overlapping, overlap_high, overlap_low = is_overlap(left_stroke, right_strokes)
-
-            # 如果：有重叠，创建首根线段。
-            if is_overlapping:
-                new_segment: Segment = Segment(
-                    id=segments_count,
-                    trend=left_stroke.trend,
-                    left_candle=left_stroke.left_candle,
-                    right_candle=right_strokes.right_candle,
-                    stroke_id_list=[left_stroke.id, middle_stroke.id, right_strokes.id]
-                )
+            new_segment: Segment = Segment(
+                id=segments_count,
+                trend=left_stroke.trend,
+                left_candle=left_stroke.left_candle,
+                right_candle=right_strokes.right_candle,
+                left_stroke_id=left_stroke.id,
+                right_stroke_id=right_strokes.id
+            )
 
-                segments.append(new_segment)
+            segments.append(new_segment)
 
-                log_event_segment_generated(
-                    log_level=log_level,
-                    new_element=new_segment
-                )
+            log_event_segment_generated(
+                log_level=log_level,
+                new_element=new_segment
+            )
 
         # 如果 线段的数量 > 0：
         #     1. 延伸线段
@@ -722,7 +692,7 @@ def generate_segments(strokes: List[Stroke],
         else:
             # 申明变量类型并赋值。
             last_segment: Segment = segments[-1]
-            last_stroke_in_segment: Stroke = strokes[last_segment.stroke_id_list[-1]]
+            last_stroke_in_segment: Stroke = strokes[last_segment.right_stroke_id]
             last_stroke: Stroke = strokes[idx]
 
             # 顺向突破，延伸线段。
@@ -733,14 +703,17 @@ def generate_segments(strokes: List[Stroke],
             #     B1. last_segment 的 trend 是 下降，且
             #     B3. last_stroke 的最低价 <= last_stroke_in_segment 的右侧价 （顺向超越或达到）：
             # 延伸（调整）笔。
-            if last_stroke.trend == last_stroke_in_segment.trend and \
+            last_trend: Trend = last_stroke.trend
+            last_right_price: float = last_stroke.right_price
+            segment_right_price: float = last_stroke_in_segment.right_price
+            if last_trend == last_stroke_in_segment.trend and \
                     (
                             (
-                                    last_stroke.trend == Trend.Bullish and
-                                    last_stroke.right_price >= last_stroke_in_segment.right_price
+                                    last_trend == _BULLISH and
+                                    last_right_price >= segment_right_price
                             ) or (
-                                    last_stroke.trend == Trend.Bearish and
-                                    last_stroke.right_price <= last_stroke_in_segment.right_price
+                                    last_trend == _BEARISH and
+                                    last_right_price <= segment_right_price
                             )
                     ):
 
@@ -752,25 +725,22 @@ def generate_segments(strokes: List[Stroke],
                     new_mc_id=last_stroke.right_merged_id,
                     old_oc_id=last_stroke_in_segment.right_ordinary_id,
                     new_oc_id=last_stroke.right_ordinary_id,
-                    strokes_changed=[
-                        i for i in range(
-                            last_stroke_in_segment.id + 1,
-                            last_stroke.id + 1
-                        )
-                    ]
+                    strokes_changed=list(range(
+                        last_stroke_in_segment.id + 1,
+                        last_stroke.id + 1
+                    ))
                 )
 
                 # 增加线段的笔。
-                for i in range(last_segment.stroke_id_list[-1] + 1, last_stroke.id + 1):
-                    last_segment.stroke_id_list.append(i)
+                last_segment.right_stroke_id = last_stroke.id
 
                 # 移动线段的右侧笔。
-                last_segment.right_stroke = last_stroke
+                last_segment.right_candle = last_stroke.right_candle
 
                 continue
 
             # 反向突破，生成反向线段。
-            if last_stroke.id - last_segment.stroke_id_list[-1] == 3:
+            if last_stroke.id - last_segment.right_stroke_id == 3:
                 left_stroke: Stroke = strokes[-3]
                 middle_stroke: Stroke = strokes[-2]
                 right_stroke: Stroke = strokes[-1]
@@ -796,23 +766,30 @@ def generate_segments(strokes: List[Stroke],
                 #         B. 左侧笔的右侧价 > 线段内右侧笔的左侧价
                 #            （创线段内右侧笔的新高）
                 # 生成反向线段。
+                segment_trend: Trend = last_segment.trend
+                right_trend: Trend = right_stroke.trend
+                left_left_price: float = left_stroke.left_price
+                left_right_price: float = left_stroke.right_price
+                right_left_price: float = right_stroke.left_price
+                right_right_price: float = right_stroke.right_price
+                segment_left_price: float = last_stroke_in_segment.left_price
                 if (
-                        last_segment.trend == Trend.Bullish and
-                        right_stroke.trend == Trend.Bearish and
-                        right_stroke.left_price < left_stroke.left_price and
+                        segment_trend == _BULLISH and
+                        right_trend == _BEARISH and
+                        right_left_price < left_left_price and
                         (
-                                right_stroke.right_price <= left_stroke.right_price
+                                right_right_price <= left_right_price
                                 or
-                                left_stroke.right_price < last_stroke_in_segment.left_price
+                                left_right_price < segment_left_price
                         )
                 ) or (
-                        last_segment.trend == Trend.Bearish and
-                        right_stroke.trend == Trend.Bullish and
-                        right_stroke.left_price > left_stroke.left_price and
+                        segment_trend == _BEARISH and
+                        right_trend == _BULLISH and
+                        right_left_price > left_left_price and
                         (
-                                right_stroke.right_price >= left_stroke.right_price
+                                right_right_price >= left_right_price
                                 or
-                                left_stroke.right_price > last_stroke_in_segment.left_price
+                                left_right_price > segment_left_price
                         )
                 ):
                     new_segment = Segment(
@@ -820,7 +797,8 @@ def generate_segments(strokes: List[Stroke],
                         trend=right_stroke.trend,
                         left_candle=left_stroke.left_candle,
                         right_candle=right_stroke.right_candle,
-                        stroke_id_list=[left_stroke.id, middle_stroke.id, right_stroke.id]
+                        left_stroke_id=left_stroke.id,
+                        right_stroke_id=right_stroke.id
                     )
                     segments.append(new_segment)
 
@@ -912,7 +890,7 @@ def run_with_dataframe(df: pd.DataFrame,
     ordinary_candle: OrdinaryCandle
     action: Action
 
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print('\n====================\n生成合并K线\n====================')
     data_chan._merged_candles = generate_merged_candles_with_dataframe(
         df=df,
@@ -920,27 +898,27 @@ def run_with_dataframe(df: pd.DataFrame,
         log_level=log_level
     )
 
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print('\n====================\n生成分型\n====================')
     data_chan._fractals = generate_fractals(data_chan.merged_candles, log_level=log_level)
 
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print('\n====================\n生成笔\n====================')
     data_chan._strokes = generate_strokes(data_chan.merged_candles, log_level=log_level)
 
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print('\n====================\n生成线段\n====================')
     data_chan._segments = generate_segments(data_chan.strokes, log_level=log_level)
 
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print('\n====================\n生成同级别分解线\n====================')
     data_chan._isolation_lines = generate_isolation_lines(data_chan.segments, log_level=log_level)
 
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print('\n====================\n生成笔中枢\n====================')
     data_chan = generate_stroke_pivots(data_chan, log_level=log_level)
 
-    if log_level.value >= LogLevel.Normal.value:
+    if log_level >= LogLevel.Normal:
         print('\n====================\n生成段中枢\n====================')
     data_chan = generate_segment_pivots(data_chan, log_level=log_level)
 
@@ -5,6 +5,7 @@ __author__ = 'Bruce Frank Wong'
 
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from .definition import (
@@ -15,7 +16,6 @@ from .definition import (
     FractalPattern,
     Trend,
 
-    OrdinaryCandle,
     MergedCandle,
     Fractal,
     Stroke,
@@ -29,13 +29,11 @@ from .utility import (
     is_inclusive_candle,
     is_fractal_pattern,
     is_overlap,
-    generate_merged_candle,
+    generate_merged_candle_list,
     generate_fractal,
 )
 from .log_message import (
     log_event_new_turn,
-    log_event_candle_generated,
-    log_event_candle_updated,
     log_event_fractal_generated,
     log_event_fractal_updated,
     log_event_fractal_dropped,
@@ -93,49 +91,13 @@ class ChanTheoryStatic(ChanTheory):
         if log_level is None:
             log_level = self._log_level
 
-        # Declare variables type.
-        ordinary_candle: OrdinaryCandle
-        new_candle: MergedCandle
-
-        old_candle_left: Optional[MergedCandle]
-        old_candle_right: Optional[MergedCandle]
-
-        # Run the loop.
-        for idx in range(count):
-            log_event_new_turn(log_level, idx, count)
-
-            ordinary_candle = OrdinaryCandle(
-                high=df.iloc[idx].at['high'].copy(),
-                low=df.iloc[idx].at['low'].copy()
-            )
-
-            if self.merged_candles_count >= 2:
-                old_candle_right = self._merged_candles[-1]
-                old_candle_left = self._merged_candles[-2]
-            elif self.merged_candles_count == 1:
-                old_candle_right = self._merged_candles[-1]
-                old_candle_left = None
-            else:
-                old_candle_right = None
-                old_candle_left = None
-
-            new_candle = generate_merged_candle(
-                ordinary_candle=ordinary_candle,
-                last_candle=(old_candle_left, old_candle_right)
-            )
-
-            if old_candle_right is None or new_candle.id != old_candle_right.id:
-                log_event_candle_generated(
-                    log_level=log_level,
-                    new_element=new_candle
-                )
-
-                self._merged_candles.append(new_candle)
-            else:
-                log_event_candle_updated(
-                    log_level=log_level,
-                    merged_candle=new_candle
-                )
+        # 从已有的合并K线继续合并，多次调用与一次调用的结果相同。
+        generate_merged_candle_list(
+            df['high'].to_numpy(dtype=np.float64)[:count],
+            df['low'].to_numpy(dtype=np.float64)[:count],
+            log_level,
+            self._merged_candles
+        )
 
     def generate_fractals(self,
                           log_level: Optional[LogLevel] = None
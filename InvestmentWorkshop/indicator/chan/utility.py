@@ -5,11 +5,22 @@ __author__ = 'Bruce Frank Wong'
 
 from typing import List, Tuple, Optional
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:     # numba 是可选依赖，没有安装时使用纯 Python 版本。
+    njit = None
+
 from .definition import (
     LogLevel,
     FirstOrLast,
     FractalPattern,
     Trend,
+    _TOP,
+    _BOTTOM,
+    _BULLISH,
+    _BEARISH,
 
     OrdinaryCandle,
     MergedCandle,
@@ -18,6 +29,10 @@ from .definition import (
     Segment,
 )
 from .log_message import (
+    log_event_new_turn,
+    log_event_candle_generated,
+    log_event_candle_updated,
+
     log_not_enough_merged_candles,
     log_show_fixed_side_candles_in_generating_stroke,
     log_show_fixed_side_pattern_in_generating_stroke,
@@ -31,6 +46,21 @@ from .log_message import (
 )
 
 
+def _jit(signature: str):
+    """
+    Compile the decorated function with numba by <signature>, if numba is installed.
+    Otherwise return the function unchanged.
+
+    :param signature: str. numba signature, compiled eagerly when the module is imported.
+    :return: decorator.
+    """
+    def decorator(function):
+        if njit is None:
+            return function
+        return njit(signature, cache=True)(function)
+    return decorator
+
+
 def is_inclusive_number(h1: float,
                         l1: float,
                         h2: float,
@@ -55,10 +85,7 @@ def is_inclusive_number(h1: float,
     ----
     :return: bool, if
     """
-    if (h1 > h2 and l1 > l2) or (h1 < h2 and l1 < l2):
-        return False
-    else:
-        return True
+    return not ((h1 > h2 and l1 > l2) or (h1 < h2 and l1 < l2))
 
 
 def is_inclusive_candle(candle_1: OrdinaryCandle,
@@ -100,18 +127,18 @@ def is_fractal_pattern(left_candle: Optional[MergedCandle],
     # Left potential fractal.
     elif left_candle is None:
         if middle_candle.high > right_candle.high and middle_candle.low > right_candle.low:
-            return FractalPattern.Top
+            return _TOP
         elif middle_candle.high < right_candle.high and middle_candle.low < right_candle.low:
-            return FractalPattern.Bottom
+            return _BOTTOM
         else:
             raise RuntimeError('Unexpected relationship in two merged candles.')
 
     # Right potential fractal.
     elif right_candle is None:
         if middle_candle.high > left_candle.high and middle_candle.low > left_candle.low:
-            return FractalPattern.Top
+            return _TOP
         elif middle_candle.high < left_candle.high and middle_candle.low < left_candle.low:
-            return FractalPattern.Bottom
+            return _BOTTOM
         else:
             raise RuntimeError('Unexpected relationship in two merged candles.')
 
@@ -119,11 +146,11 @@ def is_fractal_pattern(left_candle: Optional[MergedCandle],
     else:
         # 如果：中间K线的最高价比左右K线的最高价都高，顶分型。
         if middle_candle.high > left_candle.high and middle_candle.high > right_candle.high:
-            return FractalPattern.Top
+            return _TOP
 
         # 如果：中间K线的最低价比左右K线的最低价都低，底分型。
         elif middle_candle.low < left_candle.low and middle_candle.low < right_candle.low:
-            return FractalPattern.Bottom
+            return _BOTTOM
 
         # 其它：不是分型。
         else:
@@ -144,61 +171,26 @@ def is_overlap(left_stroke: Stroke,
              The second is float, high of the overlap range. Return None if the range not exists.
              The second is float, low of the overlap range. Return None if the range not exists.
     """
-    # 如果：
-    #     1. 右侧笔是上升笔，右侧笔的左侧价 < 左侧笔的左侧价，右侧笔的右侧价 < 左侧笔的左侧价
-    #   或者
-    #     2. 右侧笔是下降笔，右侧笔的左侧价 > 左侧笔的左侧价，右侧笔的右侧价 > 左侧笔的左侧价
-    # 无重叠。
-
-    if (
-            right_stroke.trend == Trend.Bullish and
-            right_stroke.left_price < left_stroke.left_price and
-            right_stroke.right_price < left_stroke.left_price
-    ) or (
-            right_stroke.trend == Trend.Bearish and
-            right_stroke.left_price > left_stroke.left_price and
-            right_stroke.right_price > left_stroke.left_price
-    ):
+    # 重叠区间，无论上升笔还是下降笔：
+    #     高点 = min(右侧笔的最高价, 左侧笔的最高价)，
+    #     低点 = max(右侧笔的最低价, 左侧笔的最低价)。
+    # 高点 < 低点 时无重叠。
+    left_left: float = left_stroke.left_price
+    left_right: float = left_stroke.right_price
+    right_left: float = right_stroke.left_price
+    right_right: float = right_stroke.right_price
+
+    left_high: float = left_left if left_left > left_right else left_right
+    left_low: float = left_right if left_left > left_right else left_left
+    right_high: float = right_left if right_left > right_right else right_right
+    right_low: float = right_right if right_left > right_right else right_left
+
+    overlap_high: float = right_high if right_high < left_high else left_high
+    overlap_low: float = right_low if right_low > left_low else left_low
+
+    if overlap_high < overlap_low:
         return False, None, None
 
-    # 如果：
-    #     1. 右侧笔是上升笔，且
-    #     2A. 右侧笔的左侧价 < 左侧笔的左侧价，右侧笔的右侧价 >= 左侧笔的左侧价
-    #       有重叠：
-    #       高点 = min(右侧笔的右侧价, 左侧笔的右侧价)，低点 = 左侧笔的左侧价
-    #
-    # A3. 右侧笔是上升笔，右侧笔的左侧价 >= 左侧笔的左侧价，右侧笔的右侧价 > 左侧笔的右侧价
-    #       有重叠：
-    #       高点 = min(右侧笔的右侧价, 左侧笔的左侧价)，低点 = 右侧笔的左侧价
-
-    if right_stroke.trend == Trend.Bullish:
-        if right_stroke.left_price < left_stroke.left_price <= right_stroke.right_price:
-            overlap_high = min(right_stroke.right_price, left_stroke.right_price)
-            overlap_low = left_stroke.left_price
-        elif right_stroke.left_price >= left_stroke.left_price:
-            overlap_high = min(right_stroke.right_price, left_stroke.right_price)
-            overlap_low = right_stroke.left_price
-        else:
-            raise RuntimeError('Unknown parameters in generating first segment (Bullish).')
-
-    # B2. 右侧笔是下降笔，右侧笔的左侧价 > 左侧笔的左侧价，右侧笔的右侧价 <= 左侧笔的右侧价
-    #       有重叠：
-    #       高点 = 左侧笔的左侧价，低点 = max(右侧笔的右侧价, 左侧笔的右侧价)
-    #
-    # B3. 右侧笔是下降笔，右侧笔的左侧价 <= 左侧笔的左侧价，右侧笔的右侧价 < 左侧笔的右侧价
-    #       有重叠：
-    #       高点 = 右侧笔的左侧价，低点 = max(右侧笔的右侧价, 左侧笔的左侧价)
-    else:
-        if right_stroke.left_price > right_stroke.left_price and \
-                right_stroke.right_price <= left_stroke.right_price:
-            overlap_high = left_stroke.left_price
-            overlap_low = max(right_stroke.right_price, left_stroke.right_price)
-        elif right_stroke.left_price <= right_stroke.left_price:
-            overlap_high = right_stroke.left_price
-            overlap_low = max(right_stroke.right_price, left_stroke.left_price)
-        else:
-            raise RuntimeError('Unknown parameters in generating first segment (Bearish).')
-
     return True, overlap_high, overlap_low
 
 
@@ -206,36 +198,31 @@ def get_trend(left_candle: MergedCandle,
               right_candle: OrdinaryCandle
               ) -> Trend:
     if right_candle.high > left_candle.high and right_candle.low > left_candle.low:
-        return Trend.Bullish
+        return _BULLISH
     elif right_candle.high < left_candle.high and right_candle.low < left_candle.low:
-        return Trend.Bearish
+        return _BEARISH
     else:
         raise RuntimeError('缠论K线不应存在包含关系。')
 
 
-def get_merged_candle_idx(
-        merged_candle: MergedCandle,
-        merged_candle_list: List[MergedCandle]
-) -> int:
-    return merged_candle_list.index(merged_candle)
+def get_merged_candle_idx(merged_candle: MergedCandle) -> int:
+    # 合并K线的 id 即其在列表中的位置，直接读取，不用 list.index() 逐个比较。
+    return merged_candle.id
 
 
 def get_fractal_distance(
         left_fractal: Fractal,
-        right_fractal: Fractal,
-        merged_candle_list: List[MergedCandle]
+        right_fractal: Fractal
 ) -> int:
     """
     两个分型之间的距离（取分型中间那根K线）。
 
     :param left_fractal:
     :param right_fractal:
-    :param merged_candle_list:
 
     :return:
     """
-    return get_merged_candle_idx(right_fractal.middle_candle, merged_candle_list) - \
-        get_merged_candle_idx(left_fractal.middle_candle, merged_candle_list)
+    return right_fractal.middle_candle.id - left_fractal.middle_candle.id
 
 
 def generate_merged_candle(ordinary_candle: OrdinaryCandle,
@@ -283,62 +270,316 @@ def generate_merged_candle(ordinary_candle: OrdinaryCandle,
     
     # 有包含关系：
     else:
-        # last_candle 长度为 1，取前合并K线和新普通K线的最大范围。
-        if left_candle is None:
-            right_candle.high = max(
-                right_candle.high,
-                ordinary_candle.high
-            )
-            right_candle.low = min(
-                right_candle.low,
-                ordinary_candle.low
-            )
-            right_candle.period += 1
-
-            return right_candle
-        
-        else:
+        if left_candle is not None:
             if left_candle.id > right_candle.id:
                 left_candle, right_candle = right_candle, left_candle
-            
+
             if left_candle.id == right_candle.id:
                 raise ValueError('变量 <last_candle> 中的两个合并K线的 id 相同。')
             if right_candle.id - left_candle.id != 1:
                 raise ValueError('变量 <last_candle> 中的两个合并K线的 id 序号相差超过 1。')
-            
-            if right_candle.high > left_candle.high and \
-                    right_candle.low > left_candle.low:
-                right_candle.high = max(
-                    right_candle.high,
-                    ordinary_candle.high
-                )
-                right_candle.low = max(
-                    right_candle.low,
-                    ordinary_candle.low
-                )
-                right_candle.period += 1
 
-                return right_candle
+        # last_candle 长度为 1 时取两者的最大范围，否则按前两根合并K线的方向合并。
+        state, high, low = _merge_candle_prices_py(
+            1 if left_candle is None else 2,
+            0.0 if left_candle is None else left_candle.high,
+            0.0 if left_candle is None else left_candle.low,
+            right_candle.high,
+            right_candle.low,
+            ordinary_candle.high,
+            ordinary_candle.low
+        )
+        if state < 0:
+            raise ValueError(
+                f'两个合并K线（id: {left_candle.id}, {right_candle.id}）的高低关系出错。'
+            )
+
+        right_candle.high = high
+        right_candle.low = low
+        right_candle.period += 1
+        right_candle.right_ordinary_id += 1
+
+        return right_candle
+
+
+@_jit('Tuple((int64, float64, float64))(int64, float64, float64, float64, float64, float64, float64)')
+def merge_candle_prices(merged_count: int,
+                        left_high: float,
+                        left_low: float,
+                        right_high: float,
+                        right_low: float,
+                        high: float,
+                        low: float
+                        ) -> Tuple[int, float, float]:
+    """
+    合并K线规则：一根普通K线与已有的最新合并K线合并之后，最新合并K线的状态。
+
+    :param merged_count: int. 已有的合并K线数量。
+    :param left_high:    float. 已有的倒数第2根合并K线的最高价（数量 < 2 时不使用）。
+    :param left_low:     float. 已有的倒数第2根合并K线的最低价（数量 < 2 时不使用）。
+    :param right_high:   float. 已有的最新合并K线的最高价（数量 < 1 时不使用）。
+    :param right_low:    float. 已有的最新合并K线的最低价（数量 < 1 时不使用）。
+    :param high:         float. 普通K线的最高价。
+    :param low:          float. 普通K线的最低价。
+    :return: tuple of (int, float, float). 1 表示生成了新的合并K线，0 表示合并进最新合并K线，
+             -1 表示两根合并K线高低关系出错；以及之后最新合并K线的最高价、最低价。
+    """
+    if merged_count == 0 or (right_high > high and right_low > low) or (right_high < high and right_low < low):
+        # 没有合并K线，或者没有包含关系，生成新的合并K线。
+        return 1, high, low
+
+    # 有包含关系，合并进最新合并K线。
+    if merged_count == 1:
+        return 0, max(right_high, high), min(right_low, low)
+    elif right_high > left_high and right_low > left_low:
+        return 0, max(right_high, high), max(right_low, low)
+    elif right_high < left_high and right_low < left_low:
+        return 0, min(right_high, high), min(right_low, low)
+    else:
+        return -1, right_high, right_low
+
+
+# 从 Python 逐根调用时使用未编译的版本，numba 函数每次从 Python 调用的开销比规则本身还大。
+# 编译版本只在 merge_candles 内部使用。
+_merge_candle_prices_py = getattr(merge_candle_prices, 'py_func', merge_candle_prices)
+
+
+@_jit('int64(float64[:], float64[:], int8[:], float64[:], float64[:], int64, float64, float64, float64, float64)')
+def merge_candles(high: np.ndarray,
+                  low: np.ndarray,
+                  out_is_new: np.ndarray,
+                  out_high: np.ndarray,
+                  out_low: np.ndarray,
+                  merged_count: int,
+                  left_high: float,
+                  left_low: float,
+                  right_high: float,
+                  right_low: float
+                  ) -> int:
+    """
+    逐根处理普通K线，按 merge_candle_prices 计算每根普通K线之后最新合并K线的状态。
+
+    合并K线只取决于普通K线序列，与分型、笔、线段无关，所以可以在进入逐根循环之前一次算完。
+    遇到两根合并K线高低关系出错时停止，剩余的普通K线交给 generate_merged_candle 处理（并抛出异常）。
+
+    :param high:         numpy ndarray. 普通K线的最高价。
+    :param low:          numpy ndarray. 普通K线的最低价。
+    :param out_is_new:   numpy ndarray. 输出，1 表示该普通K线生成了新的合并K线，0 表示被合并进最新合并K线。
+    :param out_high:     numpy ndarray. 输出，该普通K线之后最新合并K线的最高价。
+    :param out_low:      numpy ndarray. 输出，该普通K线之后最新合并K线的最低价。
+    :param merged_count: int. 已有的合并K线数量。
+    :param left_high:    float. 已有的倒数第2根合并K线的最高价（数量 < 2 时不使用）。
+    :param left_low:     float. 已有的倒数第2根合并K线的最低价（数量 < 2 时不使用）。
+    :param right_high:   float. 已有的最新合并K线的最高价（数量 < 1 时不使用）。
+    :param right_low:    float. 已有的最新合并K线的最低价（数量 < 1 时不使用）。
+    :return: int. 已处理的普通K线数量。
+    """
+    for idx in range(high.shape[0]):
+        state, new_high, new_low = merge_candle_prices(
+            merged_count, left_high, left_low, right_high, right_low, high[idx], low[idx]
+        )
+        if state < 0:
+            return idx
+
+        if state == 1:
+            left_high, left_low = right_high, right_low
+            merged_count += 1
+        right_high, right_low = new_high, new_low
 
-            elif right_candle.high < left_candle.high and \
-                    right_candle.low < left_candle.low:
-                right_candle.high = min(
-                    right_candle.high,
-                    ordinary_candle.high
+        out_is_new[idx] = state
+        out_high[idx] = right_high
+        out_low[idx] = right_low
+
+    return high.shape[0]
+
+
+def fold_merged_candles(is_new: np.ndarray,
+                        merged_high: np.ndarray,
+                        merged_low: np.ndarray,
+                        first_id: int = 0,
+                        first_ordinary_id: int = 0
+                        ) -> List[MergedCandle]:
+    """
+    把 merge_candles 的逐根输出折叠为合并K线列表，不逐根回放。不需要输出日志时使用。
+
+    每根合并K线从 is_new == 1 的普通K线开始，到下一根合并K线开始之前结束，
+    其最高价、最低价取结束时那根普通K线之后的状态。is_new 的第一个元素应为 1。
+
+    :param is_new:            numpy ndarray. merge_candles 的输出 out_is_new（已截取到处理过的长度）。
+    :param merged_high:       numpy ndarray. merge_candles 的输出 out_high（同上）。
+    :param merged_low:        numpy ndarray. merge_candles 的输出 out_low（同上）。
+    :param first_id:          int. 第一根合并K线的 id。
+    :param first_ordinary_id: int. is_new 第一个元素对应的普通K线 id。
+    :return: list of MergedCandle.
+    """
+    if is_new.shape[0] == 0:
+        return []
+
+    left_id: np.ndarray = np.flatnonzero(is_new)
+    right_id: np.ndarray = np.append(left_id[1:], is_new.shape[0]) - 1
+
+    return [
+        MergedCandle(
+            id=first_id + idx,
+            high=high,
+            low=low,
+            period=right - left + 1,
+            left_ordinary_id=first_ordinary_id + left
+        )
+        for idx, (left, right, high, low) in enumerate(
+            zip(
+                left_id.tolist(),
+                right_id.tolist(),
+                merged_high[right_id].tolist(),
+                merged_low[right_id].tolist()
+            )
+        )
+    ]
+
+
+def generate_merged_candle_list(high: np.ndarray,
+                                low: np.ndarray,
+                                log_level: LogLevel = LogLevel.Normal,
+                                merged_candles: Optional[List[MergedCandle]] = None
+                                ) -> List[MergedCandle]:
+    """
+    由普通K线的最高价、最低价生成合并K线列表。
+
+    先由 merge_candles 一次算出每根普通K线之后最新合并K线的状态：不输出日志时直接折叠为合并K线，
+    否则逐根回放以输出日志。merge_candles 提前停止时，剩余的普通K线交给 generate_merged_candle 处理。
+
+    :param high:           numpy ndarray. 普通K线的最高价。
+    :param low:            numpy ndarray. 普通K线的最低价。
+    :param log_level:      LogLevel. 日志级别。
+    :param merged_candles: list of MergedCandle. 已有的合并K线，从它们继续合并，结果原地追加。
+                           默认为 None，从空列表开始。
+    :return: list of MergedCandle. 即 merged_candles（如果给出）。
+    """
+    count: int = high.shape[0]
+    high_array: np.ndarray = np.array(high, dtype=np.float64)
+    low_array: np.ndarray = np.array(low, dtype=np.float64)
+
+    if merged_candles is None:
+        merged_candles = []
+    existed_count: int = len(merged_candles)
+    # 第一根新普通K线的 id，接在已有的最新合并K线之后。
+    first_ordinary_id: int = merged_candles[-1].right_ordinary_id + 1 if existed_count > 0 else 0
+    ordinary_candle: OrdinaryCandle
+    new_candle: MergedCandle
+
+    old_candle_left: Optional[MergedCandle]
+    old_candle_right: Optional[MergedCandle]
+
+    is_new_array: np.ndarray = np.empty(count, dtype=np.int8)
+    merged_high_array: np.ndarray = np.empty(count, dtype=np.float64)
+    merged_low_array: np.ndarray = np.empty(count, dtype=np.float64)
+    resolved_count: int = merge_candles(
+        high_array,
+        low_array,
+        is_new_array,
+        merged_high_array,
+        merged_low_array,
+        existed_count,
+        merged_candles[-2].high if existed_count >= 2 else 0.0,
+        merged_candles[-2].low if existed_count >= 2 else 0.0,
+        merged_candles[-1].high if existed_count >= 1 else 0.0,
+        merged_candles[-1].low if existed_count >= 1 else 0.0
+    )
+    if log_level < LogLevel.Simple:
+        # 不输出日志时，直接把逐根状态折叠为合并K线，不逐根回放。
+        # 开头被合并进已有最新合并K线的普通K线，先更新那根合并K线。
+        new_candle_ids: np.ndarray = np.flatnonzero(is_new_array[:resolved_count])
+        merged_into_last: int = int(new_candle_ids[0]) if new_candle_ids.size > 0 else resolved_count
+        if merged_into_last > 0:
+            new_candle = merged_candles[-1]
+            new_candle.high = float(merged_high_array[merged_into_last - 1])
+            new_candle.low = float(merged_low_array[merged_into_last - 1])
+            new_candle.period += merged_into_last
+            new_candle.right_ordinary_id += merged_into_last
+
+        merged_candles.extend(
+            fold_merged_candles(
+                is_new_array[merged_into_last:resolved_count],
+                merged_high_array[merged_into_last:resolved_count],
+                merged_low_array[merged_into_last:resolved_count],
+                first_id=len(merged_candles),
+                first_ordinary_id=first_ordinary_id + merged_into_last
+            )
+        )
+    else:
+        is_new_list: List[int] = is_new_array[:resolved_count].tolist()
+        merged_high_list: List[float] = merged_high_array[:resolved_count].tolist()
+        merged_low_list: List[float] = merged_low_array[:resolved_count].tolist()
+
+        for idx in range(resolved_count):
+            log_event_new_turn(log_level, idx, count)
+
+            if is_new_list[idx]:
+                new_candle = MergedCandle(
+                    id=len(merged_candles),
+                    high=merged_high_list[idx],
+                    low=merged_low_list[idx],
+                    period=1,
+                    left_ordinary_id=first_ordinary_id + idx
                 )
-                right_candle.low = min(
-                    right_candle.low,
-                    ordinary_candle.low
+                log_event_candle_generated(
+                    log_level=log_level,
+                    new_element=new_candle
                 )
-                right_candle.period += 1
-
-                return right_candle
 
+                merged_candles.append(new_candle)
             else:
-                raise ValueError(
-                    f'两个合并K线（id: {left_candle.id}, {right_candle.id}）的高低关系出错。'
+                new_candle = merged_candles[-1]
+                new_candle.high = merged_high_list[idx]
+                new_candle.low = merged_low_list[idx]
+                new_candle.period += 1
+                new_candle.right_ordinary_id += 1
+                log_event_candle_updated(
+                    log_level=log_level,
+                    merged_candle=new_candle
                 )
 
+    # merge_candles 遇到高低关系出错时提前停止，剩余的普通K线逐根处理（并抛出异常）。
+    high_list: List[float] = high_array.tolist()
+    low_list: List[float] = low_array.tolist()
+    for idx in range(resolved_count, count):
+        log_event_new_turn(log_level, idx, count)
+
+        ordinary_candle = OrdinaryCandle(
+            high=high_list[idx],
+            low=low_list[idx]
+        )
+
+        if len(merged_candles) >= 2:
+            old_candle_right = merged_candles[-1]
+            old_candle_left = merged_candles[-2]
+        elif len(merged_candles) == 1:
+            old_candle_right = merged_candles[-1]
+            old_candle_left = None
+        else:
+            old_candle_right = None
+            old_candle_left = None
+
+        new_candle = generate_merged_candle(
+            ordinary_candle=ordinary_candle,
+            last_candle=(old_candle_left, old_candle_right)
+        )
+
+        if old_candle_right is None or new_candle.id != old_candle_right.id:
+            log_event_candle_generated(
+                log_level=log_level,
+                new_element=new_candle
+            )
+
+            merged_candles.append(new_candle)
+        else:
+            log_event_candle_updated(
+                log_level=log_level,
+                merged_candle=new_candle
+            )
+
+    return merged_candles
+
 
 def generate_fractal(left_candle: MergedCandle,
                      middle_candle: MergedCandle,
@@ -396,11 +637,11 @@ def generate_fractal(left_candle: MergedCandle,
         new_fractal_pattern: Optional[FractalPattern]
         if middle_candle.high > left_candle.high and \
                 middle_candle.high > right_candle.high:
-            new_fractal_pattern = FractalPattern.Top
+            new_fractal_pattern = _TOP
 
         elif middle_candle.low < left_candle.low and \
                 middle_candle.low < right_candle.low:
-            new_fractal_pattern = FractalPattern.Bottom
+            new_fractal_pattern = _BOTTOM
 
         elif left_candle.high < middle_candle.high < right_candle.high:
             new_fractal_pattern = None
@@ -551,7 +792,7 @@ def try_to_generate_first_stroke(candles: List[MergedCandle],
         # price of candles in the two fractals, should not reach or beyond the price of fractals.
         price_low: float
         price_high: float
-        if fixed_side_fractal_pattern == FractalPattern.Top:
+        if fixed_side_fractal_pattern == _TOP:
             price_low = mobile_side_middle_candle.low
             price_high = fixed_side_middle_candle.high
         else:
@@ -587,10 +828,10 @@ def try_to_generate_first_stroke(candles: List[MergedCandle],
 
         # Generate the stroke.
         trend: Trend
-        if fixed_side_fractal_pattern == FractalPattern.Bottom:
-            trend = Trend.Bullish
+        if fixed_side_fractal_pattern == _BOTTOM:
+            trend = _BULLISH
         else:
-            trend = Trend.Bearish
+            trend = _BEARISH
 
         # Return the new stroke.
         return Stroke(
@@ -631,10 +872,10 @@ def generate_following_stroke(candles: List[MergedCandle],
     # Declare fixed side variables.
     fixed_side_middle_candle: MergedCandle = last_stroke.right_candle
     fixed_side_fractal_pattern: FractalPattern
-    if last_stroke.trend == Trend.Bullish:
-        fixed_side_fractal_pattern = FractalPattern.Top
+    if last_stroke.trend == _BULLISH:
+        fixed_side_fractal_pattern = _TOP
     else:
-        fixed_side_fractal_pattern = FractalPattern.Bottom
+        fixed_side_fractal_pattern = _BOTTOM
 
     # Log right side candles.
     log_show_fixed_side_pattern_in_generating_stroke(
@@ -706,7 +947,7 @@ def generate_following_stroke(candles: List[MergedCandle],
         # price of candles in the two fractals, should not reach or beyond the price of fractals.
         price_low: float
         price_high: float
-        if fixed_side_fractal_pattern == FractalPattern.Top:
+        if fixed_side_fractal_pattern == _TOP:
             price_low = mobile_side_middle_candle.low
             price_high = fixed_side_middle_candle.high
         else:
@@ -742,10 +983,10 @@ def generate_following_stroke(candles: List[MergedCandle],
 
         # Generate the stroke.
         trend: Trend
-        if fixed_side_fractal_pattern == FractalPattern.Bottom:
-            trend = Trend.Bullish
+        if fixed_side_fractal_pattern == _BOTTOM:
+            trend = _BULLISH
         else:
-            trend = Trend.Bearish
+            trend = _BEARISH
 
         # Return the new stroke.
         return Stroke(
@@ -811,10 +1052,10 @@ def generate_stroke(candles: List[MergedCandle],
         fixed_side_left_candle = None
         fixed_side_middle_candle = last_stroke.right_candle
         fixed_side_right_candle = None
-        if last_stroke.trend == Trend.Bullish:
-            fixed_side_fractal_pattern = FractalPattern.Top
+        if last_stroke.trend == _BULLISH:
+            fixed_side_fractal_pattern = _TOP
         else:
-            fixed_side_fractal_pattern = FractalPattern.Bottom
+            fixed_side_fractal_pattern = _BOTTOM
 
     # Log fixed side candles and fractal pattern.
     if last_stroke is None:
@@ -938,8 +1179,8 @@ def generate_stroke(candles: List[MergedCandle],
         # Generate the stroke.
         return Stroke(
             id=0 if last_stroke is None else last_stroke.id + 1,
-            trend=Trend.Bullish if fixed_side_fractal_pattern == FractalPattern.Bottom
-            else Trend.Bearish,
+            trend=_BULLISH if fixed_side_fractal_pattern == _BOTTOM
+            else _BEARISH,
             left_candle=fixed_side_middle_candle,
             right_candle=mobile_side_middle_candle
         )
@@ -19,13 +19,15 @@ def ma(df: pd.DataFrame,
                        Default value is (5, 10, 20, 60, 120).
     :return: pandas DataFrame type, only indicator data.
     """
-    result: pd.DataFrame = pd.DataFrame(
-        columns=[f'pbx{str(period)}' for period in parameters],
+    # 先算出各列，最后一次构造 DataFrame，避免逐列插入预建的 object 列。
+    close: pd.Series = df['close']
+    return pd.DataFrame(
+        {
+            f'ma{str(period)}': close.rolling(period, min_periods=5).mean()
+            for period in parameters
+        },
         index=df.index
     )
-    for period in parameters:
-        result[f'ma{str(period)}'] = df['close'].rolling(period, min_periods=5).mean()
-    return result
 
 
 def ema(df: pd.DataFrame,
@@ -17,15 +17,16 @@ def pbx(df: pd.DataFrame, parameters: Sequence[int] = (4, 6, 24)) -> pd.DataFram
                        Default value is (4, 6, 24).
     :return: pandas DataFrame type, only indicator data.
     """
-    result: pd.DataFrame = pd.DataFrame(
-        columns=[f'pbx{str(period)}' for period in parameters],
+    # 先算出各列，最后一次构造 DataFrame，避免逐列插入预建的 object 列。
+    close: pd.Series = df['close']
+    return pd.DataFrame(
+        {
+            f'pbx{str(period)}': (
+                close.ewm(span=period, adjust=False).mean() +
+                close.rolling(period * 2).mean() +
+                close.rolling(period * 4).mean()
+            ) / 3
+            for period in parameters
+        },
         index=df.index
     )
-
-    for period in parameters:
-        result[f'pbx{str(period)}'] = (
-            df['close'].ewm(span=period, adjust=False).mean() +
-            df['close'].rolling(period * 2).mean() +
-            df['close'].rolling(period * 4).mean()
-        ) / 3
-    return result
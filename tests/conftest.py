@@ -5,9 +5,12 @@ __author__ = 'Bruce Frank Wong'
 
 import pytest
 
+from typing import Callable, Tuple
 from pathlib import Path
 import os
 
+import numpy as np
+
 
 @pytest.fixture()
 def path_for_test() -> Path:
@@ -20,3 +23,20 @@ def path_for_test() -> Path:
     if not result.exists():
         result.mkdir()
     return result
+
+
+@pytest.fixture()
+def random_prices() -> Callable[[int, int], Tuple[np.ndarray, np.ndarray]]:
+    """
+    测试固件（Test Fixture），生成随机游走的普通K线最高价、最低价，包含足够多的包含关系。
+
+    :return: Callable，参数为普通K线数量和随机数种子，返回 (最高价, 最低价)。
+    """
+    def generate(size: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+        rng: np.random.Generator = np.random.default_rng(seed)
+        middle: np.ndarray = 3000.0 + rng.standard_normal(size).cumsum()
+        high: np.ndarray = middle + rng.random(size) * 3
+        low: np.ndarray = middle - rng.random(size) * 3
+        return high, low
+
+    return generate
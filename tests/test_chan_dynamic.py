@@ -0,0 +1,53 @@
+# -*- coding: UTF-8 -*-
+
+__author__ = 'Bruce Frank Wong'
+
+
+import pytest
+
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from InvestmentWorkshop.indicator.chan.definition import LogLevel
+from InvestmentWorkshop.indicator.chan.dynamic import ChanTheoryDynamic
+
+
+def run_until_first_stroke(high: List[float],
+                           low: List[float],
+                           strict_mode: bool,
+                           log_level: LogLevel
+                           ) -> Tuple[int, list, list]:
+    """
+    逐根运行，直到生成首根笔。
+
+    :return: tuple，(生成首根笔时的普通K线序号, 首根笔, 分型)。
+    """
+    chan: ChanTheoryDynamic = ChanTheoryDynamic(strict_mode=strict_mode, log_level=log_level)
+    idx: int = -1
+    for idx in range(len(high)):
+        chan.run_step_by_step(high[idx], low[idx])
+        if chan.strokes_count > 0:
+            break
+    return (
+        idx,
+        [(stroke.left_candle.id, stroke.right_candle.id, stroke.trend) for stroke in chan.strokes],
+        [(fractal.pattern, fractal.middle_candle.id, fractal.is_confirmed) for fractal in chan.fractals],
+    )
+
+
+@pytest.mark.parametrize('strict_mode', [True, False])
+@pytest.mark.parametrize('seed', range(20))
+def test_first_stroke_is_the_same_in_all_log_levels(strict_mode: bool,
+                                                    seed: int,
+                                                    random_prices: Callable[[int, int], Tuple[np.ndarray, np.ndarray]]):
+    """
+    Detailed 级别逐根K线测试的循环，与其它级别的列运算（_find_first_stroke_left_id），生成相同的首根笔。
+    """
+    high, low = random_prices(300, seed)
+
+    fast = run_until_first_stroke(high.tolist(), low.tolist(), strict_mode, LogLevel.Off)
+    detailed = run_until_first_stroke(high.tolist(), low.tolist(), strict_mode, LogLevel.Detailed)
+
+    assert len(fast[1]) == 1
+    assert fast == detailed
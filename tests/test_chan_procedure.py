@@ -0,0 +1,45 @@
+# -*- coding: UTF-8 -*-
+
+__author__ = 'Bruce Frank Wong'
+
+
+import pytest
+
+from InvestmentWorkshop.indicator.chan.definition import (
+    FractalPattern,
+    MergedCandle,
+    Fractal,
+)
+from InvestmentWorkshop.indicator.chan.procedure import _generate_fractal
+
+
+def merged_candle(idx: int, high: float, low: float) -> MergedCandle:
+    return MergedCandle(id=idx, high=high, low=low, period=1, left_ordinary_id=idx)
+
+
+def test_generate_fractal():
+    fractal: Fractal = _generate_fractal(
+        left_candle=merged_candle(0, 10.0, 5.0),
+        middle_candle=merged_candle(1, 12.0, 6.0),
+        right_candle=merged_candle(2, 11.0, 4.0),
+        new_fractal_id=0,
+        determine_distance=False,
+        determine_pattern=False
+    )
+    assert fractal.pattern == FractalPattern.Top
+    assert fractal.middle_candle.id == 1
+
+
+def test_generate_fractal_with_unexpected_relationship():
+    """
+    三根合并K线既不是顶分型、底分型，也不是单调排列（存在未处理的包含关系），抛出异常，不再只打印错误后继续。
+    """
+    with pytest.raises(RuntimeError, match='Unexpected relationship in three merged candles.'):
+        _generate_fractal(
+            left_candle=merged_candle(0, 10.0, 5.0),
+            middle_candle=merged_candle(1, 10.0, 6.0),
+            right_candle=merged_candle(2, 12.0, 7.0),
+            new_fractal_id=0,
+            determine_distance=False,
+            determine_pattern=False
+        )
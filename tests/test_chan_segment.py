@@ -0,0 +1,30 @@
+# -*- coding: UTF-8 -*-
+
+__author__ = 'Bruce Frank Wong'
+
+
+from pathlib import Path
+
+import pandas as pd
+
+from InvestmentWorkshop.indicator.chan.definition import LogLevel
+from InvestmentWorkshop.indicator.chan.dynamic import ChanTheoryDynamic
+
+
+DATA_PATH: Path = Path(__file__).parent.parent.joinpath('data')
+
+
+def test_expanded_segment_ends_at_its_last_stroke():
+    """
+    扩张线段（generate_gap_segment）时，线段的右侧K线随右侧笔移动。
+    """
+    df: pd.DataFrame = pd.read_csv(DATA_PATH.joinpath('DCE.c2201_Minute.zip')).iloc[:28000]
+    chan: ChanTheoryDynamic = ChanTheoryDynamic(log_level=LogLevel.Off)
+    chan.run_with_dataframe(df)
+
+    # 线段81 扩张到笔437，右侧合并K线是笔437的右侧K线 7234（原来停留在 7200）。
+    assert chan.segments[81].stroke_id_list[-1] == 437
+    assert chan.segments[81].right_candle.id == 7234
+
+    for segment in chan.segments:
+        assert segment.right_candle.id == chan.strokes[segment.stroke_id_list[-1]].right_candle.id
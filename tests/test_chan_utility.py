@@ -0,0 +1,161 @@
+# -*- coding: UTF-8 -*-
+
+__author__ = 'Bruce Frank Wong'
+
+
+import pytest
+
+from typing import Callable, List, Tuple
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from InvestmentWorkshop.indicator.chan.definition import (
+    LogLevel,
+    OrdinaryCandle,
+    MergedCandle,
+)
+from InvestmentWorkshop.indicator.chan.utility import (
+    merge_candle_prices,
+    merge_candles,
+    fold_merged_candles,
+    generate_merged_candle,
+    generate_merged_candle_list,
+)
+from InvestmentWorkshop.indicator.chan.procedure import generate_merged_candles_with_dataframe
+from InvestmentWorkshop.indicator.chan.static import ChanTheoryStatic
+from InvestmentWorkshop.indicator.chan.dynamic import ChanTheoryDynamic
+
+
+def candle_fields(candles: List[MergedCandle]) -> List[tuple]:
+    return [
+        (candle.id, candle.high, candle.low, candle.period, candle.left_ordinary_id, candle.right_ordinary_id)
+        for candle in candles
+    ]
+
+
+def test_fold_merged_candles_with_empty_input():
+    assert fold_merged_candles(
+        np.empty(0, dtype=np.int8),
+        np.empty(0, dtype=np.float64),
+        np.empty(0, dtype=np.float64)
+    ) == []
+
+
+@pytest.mark.parametrize('log_level', [LogLevel.Off, LogLevel.Normal])
+def test_generate_merged_candles_with_empty_input(log_level: LogLevel):
+    df: pd.DataFrame = pd.DataFrame({'high': [], 'low': []})
+
+    assert generate_merged_candle_list(np.empty(0), np.empty(0), log_level) == []
+    assert generate_merged_candles_with_dataframe(df, log_level=log_level) == []
+
+    chan: ChanTheoryStatic = ChanTheoryStatic(log_level=log_level)
+    chan.generate_merged_candles(df)
+    assert chan.merged_candles_count == 0
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_fold_merged_candles_equals_replay(seed: int,
+                                           random_prices: Callable[[int, int], Tuple[np.ndarray, np.ndarray]]):
+    """
+    不输出日志时折叠 merge_candles 的输出，结果与逐根回放相同。
+    """
+    high, low = random_prices(2000, seed)
+
+    is_new: np.ndarray = np.empty(high.shape[0], dtype=np.int8)
+    merged_high: np.ndarray = np.empty(high.shape[0], dtype=np.float64)
+    merged_low: np.ndarray = np.empty(high.shape[0], dtype=np.float64)
+    resolved_count: int = merge_candles(high, low, is_new, merged_high, merged_low, 0, 0.0, 0.0, 0.0, 0.0)
+    assert resolved_count == high.shape[0]
+    assert 0 < is_new.sum() < high.shape[0]
+
+    folded: List[MergedCandle] = generate_merged_candle_list(high, low, LogLevel.Off)
+    replayed: List[MergedCandle] = generate_merged_candle_list(high, low, LogLevel.Simple)
+
+    assert candle_fields(folded) == candle_fields(replayed)
+    assert sum(candle.period for candle in folded) == high.shape[0]
+
+
+@pytest.mark.parametrize(
+    'merged_count, left, right, ordinary, should_be',
+    [
+        (0, (0.0, 0.0), (0.0, 0.0), (10.0, 5.0), (1, 10.0, 5.0)),       # 没有合并K线
+        (1, (0.0, 0.0), (10.0, 5.0), (12.0, 6.0), (1, 12.0, 6.0)),      # 没有包含关系
+        (1, (0.0, 0.0), (10.0, 5.0), (9.0, 6.0), (0, 10.0, 5.0)),       # 只有1根合并K线，取最大范围
+        (2, (10.0, 5.0), (12.0, 6.0), (11.0, 7.0), (0, 12.0, 7.0)),     # 向上合并，取高高
+        (2, (12.0, 6.0), (10.0, 5.0), (11.0, 4.0), (0, 10.0, 4.0)),     # 向下合并，取低低
+        (2, (10.0, 5.0), (10.0, 6.0), (10.0, 6.0), (-1, 10.0, 6.0)),    # 两根合并K线高低关系出错
+    ]
+)
+def test_merge_candle_prices(merged_count: int,
+                             left: Tuple[float, float],
+                             right: Tuple[float, float],
+                             ordinary: Tuple[float, float],
+                             should_be: Tuple[int, float, float]):
+    assert merge_candle_prices(merged_count, *left, *right, *ordinary) == should_be
+
+
+def test_merge_paths_agree(random_prices: Callable[[int, int], Tuple[np.ndarray, np.ndarray]]):
+    """
+    逐根的 generate_merged_candle、动态版逐根运行与 merge_candles 批量计算，结果相同。
+    """
+    high, low = random_prices(2000, 3)
+    batch: List[MergedCandle] = generate_merged_candle_list(high, low, LogLevel.Off)
+
+    one_by_one: List[MergedCandle] = []
+    for h, l in zip(high.tolist(), low.tolist()):
+        new_candle: MergedCandle = generate_merged_candle(
+            ordinary_candle=OrdinaryCandle(high=h, low=l),
+            last_candle=(
+                one_by_one[-2] if len(one_by_one) >= 2 else None,
+                one_by_one[-1] if len(one_by_one) >= 1 else None
+            )
+        )
+        if len(one_by_one) == 0 or new_candle.id != one_by_one[-1].id:
+            one_by_one.append(new_candle)
+    assert candle_fields(one_by_one) == candle_fields(batch)
+
+    chan: ChanTheoryDynamic = ChanTheoryDynamic(log_level=LogLevel.Off)
+    for h, l in zip(high.tolist(), low.tolist()):
+        chan.run_step_by_step(h, l)
+    assert candle_fields(chan.merged_candles) == candle_fields(batch)
+
+
+@pytest.mark.parametrize('log_level', [LogLevel.Off, LogLevel.Simple])
+@pytest.mark.parametrize('split', [1, 2, 777, 1999])
+def test_generate_merged_candle_list_continues_existing_candles(
+        log_level: LogLevel,
+        split: int,
+        random_prices: Callable[[int, int], Tuple[np.ndarray, np.ndarray]]
+):
+    """
+    从已有的合并K线继续合并，结果与一次合并全部普通K线相同。
+    """
+    high, low = random_prices(2000, 4)
+    whole: List[MergedCandle] = generate_merged_candle_list(high, low, log_level)
+
+    chunked: List[MergedCandle] = generate_merged_candle_list(high[:split], low[:split], log_level)
+    result: List[MergedCandle] = generate_merged_candle_list(high[split:], low[split:], log_level, chunked)
+
+    assert result is chunked
+    assert candle_fields(chunked) == candle_fields(whole)
+
+
+def test_static_generate_merged_candles_in_chunks():
+    """
+    ChanTheoryStatic.generate_merged_candles 分两次调用，与一次调用的结果相同。
+    """
+    df: pd.DataFrame = pd.read_csv(
+        Path(__file__).parent.parent.joinpath('data', 'DCE.c2201_Minute.zip')
+    ).iloc[:2000]
+
+    whole: ChanTheoryStatic = ChanTheoryStatic(log_level=LogLevel.Off)
+    whole.generate_merged_candles(df)
+
+    chunked: ChanTheoryStatic = ChanTheoryStatic(log_level=LogLevel.Off)
+    chunked.generate_merged_candles(df.iloc[:1000])
+    chunked.generate_merged_candles(df.iloc[1000:])
+
+    assert whole.merged_candles_count == 351
+    assert candle_fields(chunked.merged_candles) == candle_fields(whole.merged_candles)